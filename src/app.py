@@ -1,21 +1,38 @@
 from functools import partial
 import json
+import multiprocessing
 import os
 from pathlib import Path
 import random
 import sys
-import tempfile
 from PySide6.QtWidgets import (
     QApplication,
     QMainWindow
 )
 from PySide6.QtCore import (QSettings, QTimer)
-from PySide6.QtGui import QIcon
-from PySide6.QtWidgets import (QFileDialog, QComboBox, QSpinBox, QMessageBox, QTableWidgetItem, QPushButton, QCheckBox)
-from constants import (COLOR_KEYS, EXCLUDED_ID_SUBSTRINGS, EXCLUDED_RAW_TYPES, NEW_DIVISION_TEMPLATE, NEW_UNIT_TEMPLATE, PLACEHOLDER_COLOR, SETTINGS, SUPPLY_MULT, TYPE_MAP, VERSION)
-from leader_dataclass import Leader
+from PySide6.QtGui import QActionGroup, QIcon, QKeySequence
+from PySide6.QtWidgets import (QFileDialog, QComboBox, QInputDialog, QLineEdit, QSpinBox, QMessageBox, QTreeView, QPushButton, QCheckBox)
+from army import Officer, Regiment
+from backup_store import BackupStore
+from constants import (CHANGE_LOG, COLOR_KEYS, NEW_DIVISION_TEMPLATE, NEW_UNIT_TEMPLATE, PLACEHOLDER_COLOR, SETTINGS, SUPPLY_MULT, TYPE_MAP, VERSION)
+from dict_tree import DictTreeModel
+from json_backend import select_backend
+from loc_table import LocFilterModel, LocTableModel
 from main_window import Ui_MainWindow
-from template_store import TemplateLoadError, TemplateStore, templates_ready
+from save_diff import Change, HashNode, append_change_log, diff_save, format_changes, hash_tree
+from save_history import SaveHistory
+from save_loader import SaveLoader
+from save_model import DIVISIONS, RESERVE_OFFICERS, RESERVE_REGIMENTS, PLAYER, DocPath, SaveModel
+from save_splice import SpliceSource, load_save
+from save_view import SaveView
+from save_writer import DEFAULT_SAVE_MODE, SAVE_MODES, SaveFormat, SaveWriter, save_format
+from template_cache import TemplateCache
+from template_ingest import format_timings
+from template_loader import TemplateLoader
+from template_models import TemplateItemModel, skill_label, unit_label
+from template_store import TEMPLATE_FOLDERS, TemplateChanges, TemplateLoadError, TemplateStore, templates_ready
+from template_watcher import TemplateWatcher
+from ui_batch import UiBatch
 from ui_helper import UIHelperMixin
 from utils.resources import resource_path
 
@@ -28,18 +45,65 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         super().__init__(parent)
         self.setupUi(self)
         self.init_widget_lists()
+        # widget changes go through it, a whole load is applied as one transaction
+        self.ui_batch = UiBatch(self.centralWidget())
         
         self.enable_widgets([self.actionLoad_File], False)
         self.enable_widgets([self.actionSave_File], False)
         
-        self.data = None
+        # the open save, widgets are bound to its paths and write edits straight into it
+        self.model = SaveModel(self)
+        # divisions the division widgets are enabled for, see show_divisions
+        self.shown_division_count: int | None = None
+        # layout of the opened save, see save_writer.detect_format
+        self.save_format: SaveFormat | None = None
+        self.splice_source: SpliceSource | None = None
+        # set while a save is written in the background
+        self.save_writer: SaveWriter | None = None
+        # set while a save is read in the background
+        self.save_loader: SaveLoader | None = None
+        # file the opened save came from, its backups are offered by Restore Backup
+        self.save_path: Path | None = None
+        # the save as loaded or last written, what save_data changed is diffed against it
+        self.save_snapshot: HashNode | None = None
+        # changes of the save being written, logged once it's on disk
+        self.save_changes: list[Change] = []
+        # undo and redo of edits to self.data, a step per action, see record_edit
+        self.history = SaveHistory()
+        # paths changed since the last step, the only ones record_edit hashes again
+        self.edited_paths: dict[DocPath, None] = {}
+        self.model.pathsChanged.connect(self.on_paths_changed)
         
         self.settings = QSettings(str(SETTINGS), QSettings.Format.IniFormat)
+        # empty picks the fastest installed JSON library, "json" forces the stdlib one
+        select_backend(self.settings.value("json/backend", "", str) or None)
+        # every save overwritten by the editor is kept first, see backup_store
+        self.backups = BackupStore()
 
         # Templates are needed for changing unit types or adding new units
         # unit stats, bust and flag are not attached to unit_types and must be manually changed
         # we need the templates for reference to generate or change units
         self.templates = TemplateStore()
+        # worker processes used to ingest the template folders, 1 loads serially
+        workers = self.settings.value("templates/workers", 0, int)
+        self.templates.workers = workers if workers else None
+        # without the dev tab only the terms used by unit and skill names are kept
+        self.templates.full_localization = DEV_FEATURES
+        # the items of every unit and every skill combo, built once per template load
+        self.unit_items = TemplateItemModel(unit_label, self)
+        self.skill_items = TemplateItemModel(skill_label, self)
+        for combo in [*self.reserve_combos, *self.regiment_combos]:
+            combo.setModel(self.unit_items)
+        for combo in [*self.leader_skill_combos, *self.reserve_leader_skill_combos]:
+            combo.setModel(self.skill_items)
+        # parsed templates are kept next to settings.ini, a warm start only checks file fingerprints
+        self.template_cache = TemplateCache()
+        self.game_path: Path | None = None
+        # game data patched or modded while the editor is open gets picked up file by file
+        self.template_watcher = TemplateWatcher(self)
+        self.template_watcher.templatesChanged.connect(self.on_templates_changed)
+        # templates load on a background thread, see on_game_path_button_triggered
+        self.template_loader: TemplateLoader | None = None
         
         saved_game_dir = self.settings.value("paths/game_dir", "", str)
         QTimer.singleShot(0, lambda: self.on_game_path_button_triggered(saved_game_dir))
@@ -51,6 +115,11 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         self.statusBar().showMessage("Ready")
         
         self.setup_connections()
+        self.setup_bindings()
+        self.setup_save_mode_menu()
+        self.setup_backup_menu()
+        self.setup_history_menu()
+        self.setup_template_inspectors()
         
         dev_index = self.tabWidget.indexOf(self.devTab)
         self.tabWidget.setTabVisible(dev_index, False)
@@ -61,43 +130,50 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         
         if DEV_FEATURES:
             self.tabWidget.setTabVisible(dev_index, True)
-            with open("./save_folder/test.fcs", "r", encoding="utf-8") as f:
-                self.data = json.load(f)
+            self.save_path = Path("./save_folder/test.fcs")
+            self.data, self.splice_source = load_save(self.save_path, self.settings.value("save/intern", True, bool))
+            self.save_snapshot = hash_tree(self.data)
+            self.history.reset(self.data)
+            self.edited_paths.clear()
+            self.save_format = self.splice_source.format
             
+            # filled in once the templates are loaded, see on_templates_loaded
             self.refresh_ui()
-            QTimer.singleShot(
-                0, 
-                lambda: self.load_data()
-            )
-            QTimer.singleShot(
-                0, 
-                lambda: self.set_original_values()
-            )
             self.actionSave_File.setEnabled(True)
     
     def pick_game_folder(self) -> Path | None:
         folder = QFileDialog.getExistingDirectory(self, "Select game folder")
         return Path(folder) if folder else None
 
+    @property
+    def data(self):
+        return self.model.data
+
+    @data.setter
+    def data(self, data):
+        self.model.reset(data, notify=False)
+
     def load_data(self):
-        self.disable_all_widgets()
-        self.refresh_ui()
-        if self.data is None:
-            return
-        
-        player_data = self.data["PlayerSaveData"]
-        army_data = player_data["ArmySaveData"]
-        divisions_data = army_data["Divisions"]
-        reserve_regiments_data = army_data["ReserveRegiments"]
-        reserve_leaders_data = army_data["ReserveOfficers"]
-        
-        self.goldSpinBox.setValue(player_data["Cash"])
-        self.supplySpinBox.setValue(player_data["Food"])
-        self.ammoSpinBox.setValue(player_data["Ammo"])
-        self.manpowerSpinBox.setValue(player_data["Manpower"])
-        
-        for i, item in enumerate(reserve_regiments_data):
-            if item is None:
+        # every widget again, for a new save or new templates, edits only update their own widgets
+        with self.ui_batch.transaction():
+            self.disable_all_widgets()
+            self.refresh_ui()
+            if self.data is None:
+                return
+            
+            self.shown_division_count = None
+            self.model.reset(self.data)
+            self.on_load_file_UI_handler(len(self.model.get(DIVISIONS, [])), len(self.model.get(RESERVE_OFFICERS, [])))
+        
+    def apply_save_view(self, view: SaveView):
+        # only sets widgets, every value was read by build_save_view
+        self.ui_batch.set(self.goldSpinBox, "value", view.cash)
+        self.ui_batch.set(self.supplySpinBox, "value", view.food)
+        self.ui_batch.set(self.ammoSpinBox, "value", view.ammo)
+        self.ui_batch.set(self.manpowerSpinBox, "value", view.manpower)
+        
+        for i, regiment in enumerate(view.reserve_regiments):
+            if regiment is None:
                 continue
             combo = getattr(self, f"reserveTypeComboBox_{i+1}", None)
             spinbox = getattr(self, f"reserveVeterancySpinBox_{i+1}", None)
@@ -105,192 +181,50 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
                 continue
             if not isinstance(spinbox, QSpinBox):
                 continue
-            combo.setCurrentText(self.get_unit_loc(item["UnitID"]))
-            spinbox.setValue(item["CurrentLevel"])
+            self.ui_batch.set(combo, "index", max(self.unit_items.row(regiment.unit_id), 0))
+            self.ui_batch.set(spinbox, "value", regiment.level)
         
-        for i in range(len(divisions_data)):
-            for j in range(4):
+        for i, regiments in enumerate(view.divisions):
+            for j, regiment in enumerate(regiments):
                 combo = getattr(self, f"regimentTypeComboBox_{i+1}_{j+1}", None)
                 spinbox = getattr(self, f"veterancySpinBox_{i+1}_{j+1}", None)
                 if not isinstance(combo, QComboBox):
                     continue
                 if not isinstance(spinbox, QSpinBox):
                     continue
-                regiment = divisions_data[i]["Regiments"][j]
                 if regiment is None:
                     # no unit here
                     continue
-                combo.setCurrentText(self.get_unit_loc(regiment["UnitID"]))
-                spinbox.setValue(regiment["CurrentLevel"])
+                self.ui_batch.set(combo, "index", max(self.unit_items.row(regiment.unit_id), 0))
+                self.ui_batch.set(spinbox, "value", regiment.level)
                 
-        for i, item in enumerate(reserve_leaders_data):
-            if item is None:
+        for i, officer in enumerate(view.reserve_officers):
+            if officer is None:
                 continue
-            self.reserve_leader_label[i].setText(f"{item["Name"]} {item["LastName"]}")
-            self.reserve_leader_level_spinbox[i].setValue(item["Level"])
-            self.reserve_leader_skillpoints_spinbox[i].setValue(item["SkillPointsAvailable"])
-            for j in range(len(item["SkillSaves"])):
+            self.ui_batch.set(self.reserve_leader_label[i], "text", officer.label)
+            self.ui_batch.set(self.reserve_leader_level_spinbox[i], "value", officer.level)
+            self.ui_batch.set(self.reserve_leader_skillpoints_spinbox[i], "value", officer.skill_points)
+            for j, skill_id in enumerate(officer.skill_ids):
                 index = (i*5)+j
                 combo = self.reserve_leader_skill_combos[index]
-                combo.setCurrentText(self.get_skill_loc(item["SkillSaves"][j]))
+                self.ui_batch.set(combo, "index", max(self.skill_items.row(skill_id), 0))
         
-        for i, item in enumerate(divisions_data):
-            leader = item["OfficerSave"]
-            if leader is None:
+        for i, officer in enumerate(view.officers):
+            if officer is None:
                 continue
-            self.leader_label[i].setText(f"{leader["Name"]} {leader["LastName"]}")
-            self.leader_level_spinbox[i].setValue(leader["Level"])
-            self.leader_skillpoints_spinbox[i].setValue(leader["SkillPointsAvailable"])
-            for j in range(len(leader["SkillSaves"])):
+            self.ui_batch.set(self.leader_label[i], "text", officer.label)
+            self.ui_batch.set(self.leader_level_spinbox[i], "value", officer.level)
+            self.ui_batch.set(self.leader_skillpoints_spinbox[i], "value", officer.skill_points)
+            for j, skill_id in enumerate(officer.skill_ids):
                 index = (i*5)+j
                 combo = self.leader_skill_combos[index]
-                combo.setCurrentText(self.get_skill_loc(leader["SkillSaves"][j]))
+                self.ui_batch.set(combo, "index", max(self.skill_items.row(skill_id), 0))
 
-        self.on_load_file_UI_handler(len(divisions_data), len(reserve_leaders_data))
+        self.on_load_file_UI_handler(len(view.divisions), len(view.reserve_officers))
+        self.shown_division_count = len(view.divisions)
         
-    def save_data(self):
-        if self.data is None:
-            return
-        
-        player_data = self.data["PlayerSaveData"]
-        army_data = player_data["ArmySaveData"]
-        divisions_data = army_data["Divisions"]
-        reserve_regiments_data = army_data["ReserveRegiments"]
-        reserve_officers_data = army_data["ReserveOfficers"]
-        
-        # resources
-        player_data["Cash"] = self.goldSpinBox.value()
-        player_data["Food"] = self.supplySpinBox.value()
-        player_data["Ammo"] = self.ammoSpinBox.value()
-        player_data["Manpower"] = self.manpowerSpinBox.value()
-        
-        # detect any change for future logging
-        for i, item in enumerate(divisions_data):
-            if item is not None:
-                
-                leader = item["OfficerSave"]
-                
-                if leader is not None:
-                
-                    leader_obj = Leader(leader)
-                    
-                    skill_set = []
-                    for j in range(5):
-                        index = ( i * 5 ) + j
-                        combo = self.leader_skill_combos[index]
-                        combo_current = combo.currentData()
-                        
-                        if combo_current:
-                            skill_set.append(combo_current)
-                    
-                    leader_obj.set_level(self.leader_level_spinbox[i].value())
-                    leader_obj.set_skill_points(self.leader_skillpoints_spinbox[i].value())
-                    leader_obj.set_skills(skill_set)
-                    
-                    item["OfficerSave"] = leader_obj.data
-            
-            ###############################################
-            
-            for j in range(4):
-                combo = getattr(self, f"regimentTypeComboBox_{i+1}_{j+1}", None)
-                spinbox = getattr(self, f"veterancySpinBox_{i+1}_{j+1}", None)
-                if not isinstance(combo, QComboBox):
-                    continue
-                if not isinstance(spinbox, QSpinBox):
-                    continue
-                
-                combo_current = combo.currentData()
-
-                if self._detect_changed_value(combo, combo_current):
-                    if combo_current is None:
-                        new_regiment = None
-                    else:
-                        new_regiment = self.handle_unit_type_change(item["Regiments"][j], combo_current, j)
-                    item["Regiments"][j] = new_regiment
-                
-                spin_current = spinbox.value()
-
-                if self._detect_changed_value(spinbox, spin_current):
-                    new_regiment = item["Regiments"][j]
-                    if new_regiment is not None:
-                        new_regiment["CurrentLevel"] = spinbox.value()
-                
-        for i, item in enumerate(reserve_officers_data):
-            if item is None:
-                continue
-            
-            leader_obj = Leader(item)
-                    
-            skill_set = []
-            for j in range(5):
-                index = ( i * 5 ) + j
-                combo = self.reserve_leader_skill_combos[index]
-                current_data = combo.currentData()
-                
-                if current_data:
-                    skill_set.append(current_data)
-            
-            leader_obj.set_level(self.reserve_leader_level_spinbox[i].value())
-            leader_obj.set_skill_points(self.reserve_leader_skillpoints_spinbox[i].value())
-            leader_obj.set_skills(skill_set)
-            
-            item = leader_obj.data
-            
-        for i, item in enumerate(reserve_regiments_data):
-            
-            combo = getattr(self, f"reserveTypeComboBox_{i+1}", None)
-            spinbox = getattr(self, f"reserveVeterancySpinBox_{i+1}", None)
-            if not isinstance(combo, QComboBox):
-                continue
-            if not isinstance(spinbox, QSpinBox):
-                continue
-            
-            combo_current = combo.currentData()
-
-            if self._detect_changed_value(combo, combo_current):
-                if combo_current is None:
-                    new_regiment = None
-                else:
-                    new_regiment = self.handle_unit_type_change(item, combo_current, i)
-                reserve_regiments_data[i] = new_regiment
-
-            spin_current = spinbox.value()
-
-            if self._detect_changed_value(spinbox, spin_current):
-                new_regiment = item
-                if new_regiment is not None:
-                    new_regiment["CurrentLevel"] = spinbox.value()
-
     def handle_unit_type_change(self, regiment, new_unit_type, position):
         
-        def find_tree_and_prereq_by_unit_id(data, unit_id):
-            prereq_list = None
-            tree = None
-            for tree_name, tree in data.items():
-                items = tree["Items"]
-                if unit_id in items:
-                    prereq_list = get_prereq(unit_id, tree["Items"])
-                    return tree_name, prereq_list
-            
-            return None, []
-        
-        def get_prereq(unit_id, tree) -> list:
-            prereq_list = tree.get(unit_id)["Prerequisite"]
-            result = []
-            
-            if prereq_list is None:
-                return []
-            
-            for item in prereq_list:
-                res = get_prereq(item, tree)
-                if res is None:
-                    return []
-                else:
-                    result.append(item)
-                    result.extend(res)
-            
-            return result
-        
         def validate_bust_data(data):
             def make_placeholder():
                 return [PLACEHOLDER_COLOR]
@@ -352,108 +286,92 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         category = TYPE_MAP[unit["RawUnitType"]]
         supply = SUPPLY_MULT[category]
 
-        tree_id, prereq = find_tree_and_prereq_by_unit_id(self.templates.upgrade_template, new_unit_type)
+        # tree and prerequisites are indexed when the templates load, see UpgradeIndex
+        tree_id, prereq = self.templates.upgrade_index.lookup(new_unit_type)
         new_bust = validate_bust_data(bust_list)
         
-        regiment["TargetManpower"] = unit["MaxManpower"]
-        regiment["Manpower"] = unit["MaxManpower"]
-        regiment["MaxManpower"] = unit["MaxManpower"]
-        regiment["MeleeAttribute"] = unit["BaseStats"]["MeleeSkill"]
-        regiment["AccuracyAttribute"] = unit["BaseStats"]["RangedSkill"]
-        regiment["ReloadAttribute"] = unit["BaseStats"]["ReloadSkill"]
-        regiment["MoraleAttribute"] = unit["BaseStats"]["Morale"]
-        regiment["FatigueAttribute"] = unit["BaseStats"]["FatigueSkill"]
-        regiment["ChargeBonusAttribute"] = int(unit["BaseStats"]["ChargeBonus"])
-        regiment["WalkSpeed"] = int(unit["BaseStats"]["WalkSpeed"])
-        regiment["RunSpeed"] = int(unit["BaseStats"]["SprintSpeed"])
-        regiment["PreviousUnlockedUnits"] = prereq
-        regiment["BustData"] = new_bust
-        regiment["FlagSave"] = flag
-        regiment["Name"] = unit["Name"]
-        regiment["UnitID"] = new_unit_type
-        regiment["UpgradeTreeID"] = tree_id
-        regiment["Supply"] = int((unit["MaxManpower"] // 100) * supply)
-        regiment["DivisionPosition"] = position
+        stats = unit["BaseStats"]
+        view = Regiment(regiment)
+        view.target_manpower = unit["MaxManpower"]
+        view.manpower = unit["MaxManpower"]
+        view.max_manpower = unit["MaxManpower"]
+        view.melee = stats["MeleeSkill"]
+        view.accuracy = stats["RangedSkill"]
+        view.reload = stats["ReloadSkill"]
+        view.morale = stats["Morale"]
+        view.fatigue = stats["FatigueSkill"]
+        view.charge_bonus = int(stats["ChargeBonus"])
+        view.walk_speed = int(stats["WalkSpeed"])
+        view.run_speed = int(stats["SprintSpeed"])
+        view.previous_unlocked_units = prereq
+        view.bust = new_bust
+        view.flag = flag
+        view.name = unit["Name"]
+        view.unit_id = new_unit_type
+        view.upgrade_tree_id = tree_id
+        view.supply = int((unit["MaxManpower"] // 100) * supply)
+        view.division_position = position
         
         return regiment
     
     def populate_comboboxes(self):
-                
-        for i in range(5):
-            combo = getattr(self, f"reserveTypeComboBox_{i+1}", None)
-            if not isinstance(combo, QComboBox):
-                continue
-                
-            self._populate_unit_combo(combo)
-
-            
-        for i in range(5):
-            for j in range(4):
-                name = f"regimentTypeComboBox_{i+1}_{j+1}"
-                combo = getattr(self, name, None)
-
-                if not isinstance(combo, QComboBox):
-                    continue
-                
-                self._populate_unit_combo(combo)
-            
-        all_leader_skill_combos = [
-            *self.leader_skill_combos,
-            *self.reserve_leader_skill_combos,
-        ]
-        for combo in all_leader_skill_combos:
-            self._populate_skill_combo(combo)
+        # the combos show the shared models, only those are rebuilt
+        self.unit_items.set_template(self.templates.unit_template)
+        self.skill_items.set_template(self.templates.skill_template)
     
-    def _populate_unit_combo(self, combo: QComboBox):
-        if self.templates.unit_template is None:
-            return
-        
-        combo.blockSignals(True)
-        combo.clear()
-        combo.addItem(" ", None)
-
-        for key, value in self.templates.unit_template.items():
-            if self._is_excluded(key.lower()) or value["RawUnitType"] in EXCLUDED_RAW_TYPES:
-                continue
-            combo.addItem(value["Name"], key)
-
-        combo.blockSignals(False)
+    def populate_dev_tabs(self):
+        # the trees only make rows for what gets expanded, see DictTreeModel
+        for name, model in self.template_trees.items():
+            model.set_data(getattr(self.templates, name))
+        self.template_search_positions.clear()
+        
+        # rows are read from the store as they're painted, the search box filters through LocIndex
+        self.loc_table.set_store(self.templates.loc_dict)
+        self.loc_filter.set_filter(self.locSearchLineEdit.text())
+        self.locTableView.resizeColumnToContents(0)
+        
+    def setup_template_inspectors(self):
+        # template name -> model of its tree on the dev tab
+        self.template_trees: dict[str, DictTreeModel] = {}
+        # model -> match shown, return steps to the next one
+        self.template_search_positions: dict[DictTreeModel, int] = {}
+        trees = {
+            "unit_template": (self.unitTemplateTreeView, self.unitTemplateSearchLineEdit),
+            "flag_template": (self.flagTemplateTreeView, self.flagTemplateSearchLineEdit),
+            "bust_template": (self.bustTemplateTreeView, self.bustTemplateSearchLineEdit),
+            "upgrade_template": (self.upgradeTemplateTreeView, self.upgradeTemplateSearchLineEdit),
+            "skill_template": (self.skillsTreeView, self.skillsSearchLineEdit),
+        }
+        for name, (view, search) in trees.items():
+            model = DictTreeModel(view)
+            view.setModel(model)
+            search.textChanged.connect(partial(self.on_template_search, view, model, search, 0))
+            search.returnPressed.connect(partial(self.on_template_search, view, model, search, 1))
+            self.template_trees[name] = model
+        
+        self.loc_table = LocTableModel(self.locTableView)
+        self.loc_filter = LocFilterModel(self.loc_table, self.locTableView)
+        self.locTableView.setModel(self.loc_filter)
+        self.locSearchLineEdit.textChanged.connect(self.on_loc_search)
     
-    def _populate_skill_combo(self, combo: QComboBox):
-        if self.templates.skill_template is None:
-            return
-        
-        combo.blockSignals(True)
-        combo.clear()
-        combo.addItem(" ", None)
-
-        for key, value in self.templates.skill_template.items():
-            combo.addItem(value, key)
-
-        combo.blockSignals(False)
+    def on_loc_search(self, text: str):
+        self.loc_filter.set_filter(text)
+        if text:
+            self.statusBar().showMessage(f"{self.loc_filter.rowCount()} of {self.loc_table.rowCount()} terms")
     
-    def populate_dev_tabs(self):
-        self.unitTemplateTreeWidget.setHeaderLabels(["Key", "Value"])
-        self.add_dict_to_tree(self.unitTemplateTreeWidget.invisibleRootItem(), self.templates.unit_template)
-        self.flagTemplateTreeWidget.setHeaderLabels(["Key", "Value"])
-        self.add_dict_to_tree(self.flagTemplateTreeWidget.invisibleRootItem(), self.templates.flag_template)
-        self.bustTemplateTreeWidget.setHeaderLabels(["Key", "Value"])
-        self.add_dict_to_tree(self.bustTemplateTreeWidget.invisibleRootItem(), self.templates.bust_template)
-        self.upgradeTemplateTreeWidget.setHeaderLabels(["Key", "Value"])
-        self.add_dict_to_tree(self.upgradeTemplateTreeWidget.invisibleRootItem(), self.templates.upgrade_template)
-        self.skillsTreeWidget.setHeaderLabels(["Key", "Value"])
-        self.add_dict_to_tree(self.skillsTreeWidget.invisibleRootItem(), self.templates.skill_template)
-        
-        if self.templates.loc_dict is None:
+    def on_template_search(self, view: QTreeView, model: DictTreeModel, search: QLineEdit, step: int, *args):
+        # typing shows the first match, return the next
+        matches = model.find(search.text())
+        if not matches:
+            self.statusBar().showMessage("No matches" if search.text() else "")
             return
-        
-        for row, (key, value) in enumerate(self.templates.loc_dict.items()):
-            self.locTableWidget.setRowCount(len(self.templates.loc_dict))
-            self.locTableWidget.setItem(row, 0, QTableWidgetItem(str(key)))
-            self.locTableWidget.setItem(row, 1, QTableWidgetItem(str(value)))
-
-        self.locTableWidget.resizeColumnsToContents()
-        
+        position = (self.template_search_positions.get(model, -1) + step) % len(matches) if step else 0
+        self.template_search_positions[model] = position
+        index = model.index_of(matches[position])
+        view.scrollTo(index)
+        view.setCurrentIndex(index)
+        self.statusBar().showMessage(f"Match {position + 1} of {len(matches)}")
+    
     def setup_connections(self):
         self.actionLoad_File.triggered.connect(self.on_load_button_triggered)
         self.actionSave_File.triggered.connect(self.on_save_button_triggered)
@@ -482,6 +400,11 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
                 partial(self.on_division_checkbox_triggered, checkbox)
             )
     
+    def officer_path(self, index: int, reserve: bool) -> DocPath:
+        if reserve:
+            return RESERVE_OFFICERS + (index,)
+        return DIVISIONS + (index, "OfficerSave")
+
     def on_create_leader_button_triggered(self, widget: QPushButton):
         reserve: bool = widget.property("reserveLeader")
         index = int(widget.property("index"))
@@ -489,15 +412,8 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         if self.data is None:
             return
         
-        leader_template = Leader()
-        if reserve:
-            self.data["PlayerSaveData"]["ArmySaveData"]["ReserveOfficers"][index] = leader_template.data
-        else:
-            divisions_data = self.data["PlayerSaveData"]["ArmySaveData"]["Divisions"]
-            divisions_data[index]["OfficerSave"] = leader_template.data
-        
-        self.save_data()
-        self.load_data()
+        self.model.set(self.officer_path(index, reserve), Officer.new().data)
+        self.record_edit()
     
     def on_delete_leader_button_triggered(self, widget: QPushButton):
         reserve: bool = widget.property("reserveLeader")
@@ -506,39 +422,24 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         if self.data is None:
             return
         
-        if reserve:
-            self.data["PlayerSaveData"]["ArmySaveData"]["ReserveOfficers"][index] = None
-        else:
-            divisions_data = self.data["PlayerSaveData"]["ArmySaveData"]["Divisions"]
-            divisions_data[index]["OfficerSave"] = None
-            
-        self.save_data()
-        self.load_data()
+        self.model.set(self.officer_path(index, reserve), None)
+        self.record_edit()
     
     def on_division_checkbox_triggered(self, widget: QCheckBox):
         index = int(widget.property("index"))
         checked: bool = widget.isChecked()
         
-        end = index + 1 if checked else 5
-        
-        self.enable_divisions(index, end, checked)
-        
-        if checked:
-            if index < 4:
-                self.enable_widgets([self.division_checkboxes[index + 1]], True)
-        else:
-            self.enable_widgets(self.division_checkboxes[index + 1:], False)
-        
+        # the widgets follow the division count, see show_divisions
         amount = index + 1 if checked else index
         self.modify_division_count(amount, checked)
-        self.save_data()
-        self.load_data()
+        self.record_edit()
     
     def modify_division_count(self, new_division_count, add: bool):
         if self.data is None:
             return
         
-        divisions_data: list = self.data["PlayerSaveData"]["ArmySaveData"]["Divisions"]
+        divisions_data: list = self.model.writable(DIVISIONS)
+        old_count = len(divisions_data)
         
         if add:
             while len(divisions_data) < new_division_count:
@@ -546,6 +447,137 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         else:
             while len(divisions_data) > new_division_count:
                 divisions_data.pop()
+        
+        changed = range(min(old_count, len(divisions_data)), max(old_count, len(divisions_data)))
+        with self.ui_batch.transaction():
+            self.model.changed([DIVISIONS + (i,) for i in changed])
+    
+    def setup_bindings(self):
+        # each widget shows one path of the save and writes its edits back to it
+        resources = zip(self.resource_spinboxes, ("Cash", "Food", "Ammo", "Manpower"))
+        for spinbox, key in resources:
+            self.bind_spinbox(spinbox, PLAYER + (key,))
+        
+        self.model.bind(DIVISIONS, self.show_divisions, deep=True)
+        for i in range(5):
+            for j in range(4):
+                path = DIVISIONS + (i, "Regiments", j)
+                self.bind_unit_combo(self.regiment_combos[i * 4 + j], path, j)
+                self.bind_spinbox(self.regiment_spinboxes[i * 4 + j], path + ("CurrentLevel",))
+        
+        for i in range(5):
+            path = RESERVE_REGIMENTS + (i,)
+            self.bind_unit_combo(self.reserve_combos[i], path, i)
+            self.bind_spinbox(self.reserve_spinboxes[i], path + ("CurrentLevel",))
+        
+        for reserve in (False, True):
+            for i in range(5):
+                self.bind_officer(i, reserve)
+    
+    def bind_spinbox(self, spinbox: QSpinBox, path: DocPath):
+        self.model.bind(path, partial(self.show_spinbox_value, spinbox))
+        # an empty slot has no value to set, the edit is dropped
+        spinbox.valueChanged.connect(partial(self.model.set, path))
+        spinbox.editingFinished.connect(self.record_edit)
+    
+    def show_spinbox_value(self, spinbox: QSpinBox, value):
+        self.ui_batch.set(spinbox, "value", value if isinstance(value, int) else 0)
+    
+    def bind_unit_combo(self, combo: QComboBox, path: DocPath, position: int):
+        # deep, a unit change patched back by undo arrives as changes to the regiment's members
+        self.model.bind(path, partial(self.show_unit, combo), deep=True)
+        # activated is only emitted for the user's picks, not for show_unit
+        combo.activated.connect(partial(self.on_unit_combo_activated, combo, path, position))
+    
+    def show_unit(self, combo: QComboBox, regiment):
+        index = self.unit_items.row(Regiment(regiment).unit_id) if regiment is not None else 0
+        self.ui_batch.set(combo, "index", max(index, 0))
+    
+    def on_unit_combo_activated(self, combo: QComboBox, path: DocPath, position: int, index: int):
+        unit_type = combo.currentData()
+        if unit_type is None:
+            regiment = None
+        else:
+            current = self.model.writable(path) if self.model.get(path) is not None else None
+            regiment = self.handle_unit_type_change(current, unit_type, position)
+            if regiment is None:
+                # templates missing, back to what the save has
+                self.model.changed([path])
+                return
+        self.model.set(path, regiment)
+        self.record_edit()
+    
+    def bind_officer(self, index: int, reserve: bool):
+        path = self.officer_path(index, reserve)
+        skill_combos = (self.reserve_leader_skill_combos if reserve else self.leader_skill_combos)[index * 5:index * 5 + 5]
+        level_spinbox = (self.reserve_leader_level_spinbox if reserve else self.leader_level_spinbox)[index]
+        points_spinbox = (self.reserve_leader_skillpoints_spinbox if reserve else self.leader_skillpoints_spinbox)[index]
+        
+        self.model.bind(path, partial(self.show_officer, index, reserve), deep=True)
+        self.bind_spinbox(level_spinbox, path + ("Level",))
+        self.bind_spinbox(points_spinbox, path + ("SkillPointsAvailable",))
+        self.model.bind(path + ("SkillSaves",), partial(self.show_skills, skill_combos), deep=True)
+        for combo in skill_combos:
+            combo.activated.connect(partial(self.on_skill_combo_activated, skill_combos, path + ("SkillSaves",)))
+    
+    def show_officer(self, index: int, reserve: bool, officer):
+        if reserve:
+            label = self.reserve_leader_label[index]
+            exists = index < len(self.model.get(RESERVE_OFFICERS, []))
+            officer_widgets = [
+                self.reserve_leader_level_spinbox[index],
+                self.reserve_leader_skillpoints_spinbox[index],
+                *self.reserve_leader_skill_combos[index * 5:index * 5 + 5],
+                self.delete_reserve_leader_buttons[index],
+            ]
+            create_button = self.create_reserve_leader_buttons[index]
+        else:
+            label = self.leader_label[index]
+            exists = self.model.get(DIVISIONS + (index,)) is not None
+            officer_widgets = [
+                self.leader_level_spinbox[index],
+                self.leader_skillpoints_spinbox[index],
+                *self.leader_skill_combos[index * 5:index * 5 + 5],
+                self.delete_leader_buttons[index],
+            ]
+            create_button = self.create_leader_buttons[index]
+        
+        self.ui_batch.set(label, "text", Officer(officer).full_name if officer is not None else "")
+        self.enable_widgets([label], exists and (officer is not None or not reserve))
+        self.enable_widgets(officer_widgets, exists and officer is not None)
+        self.enable_widgets([create_button], exists and officer is None)
+    
+    def show_skills(self, combos: list[QComboBox], skills):
+        skills = skills or []
+        for j, combo in enumerate(combos):
+            index = self.skill_items.row(skills[j]) if j < len(skills) else 0
+            self.ui_batch.set(combo, "index", max(index, 0))
+    
+    def on_skill_combo_activated(self, combos: list[QComboBox], path: DocPath, index: int):
+        # empty combos are skipped, the skills shift up to fill them
+        self.model.set(path, [combo.currentData() for combo in combos if combo.currentData()])
+        self.record_edit()
+    
+    def show_divisions(self, divisions):
+        # deep so undo adding or removing a division gets here, most changes below don't change the count
+        count = len(divisions) if isinstance(divisions, list) else 0
+        if count == self.shown_division_count:
+            return
+        previous = self.shown_division_count
+        self.shown_division_count = count
+        
+        changed = range(5) if previous is None else range(min(previous, count), min(max(previous, count) + 1, 5))
+        for i in changed:
+            exists = i < count
+            checkbox = self.division_checkboxes[i]
+            self.ui_batch.set(checkbox, "checked", exists)
+            # the first division can't be removed, past the last only the next one can be added
+            self.enable_widgets([checkbox], i != 0 and i <= count)
+            self.enable_widgets([
+                self.leader_label[i],
+                *self.regiment_combos[i * 4:i * 4 + 4],
+                *self.regiment_spinboxes[i * 4:i * 4 + 4],
+            ], exists)
     
     def on_load_button_triggered(self):
         last = self.settings.value("paths/last_open_dir", "", str)
@@ -565,17 +597,69 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         if not path:
             return
 
-        with open(path, "r", encoding="utf-8") as f:
-            self.data = json.load(f)
+        self.start_save_loader(Path(path))
+    
+    def start_save_loader(self, path: Path):
+        # parsing and reading the widget values happen on a worker, see SaveLoader
+        # a file picked while another is still loading replaces it
+        # repeated inventories, slots and colors are shared unless turned off in settings.ini
+        intern = self.settings.value("save/intern", True, bool)
+        loader = SaveLoader(path, intern, self)
+        loader.phaseStarted.connect(partial(self.on_save_load_phase, loader))
+        loader.saveLoaded.connect(partial(self.on_save_loaded, loader))
+        loader.loadFailed.connect(partial(self.on_save_load_failed, loader))
+        loader.finished.connect(loader.deleteLater)
+        self.save_loader = loader
+        
+        self.actionSave_File.setEnabled(False)
+        loader.start()
+    
+    def on_save_load_phase(self, loader: SaveLoader, message: str):
+        if loader is self.save_loader:
+            self.statusBar().showMessage(message)
+    
+    def on_save_loaded(self, loader: SaveLoader, data, source: SpliceSource, view: SaveView, snapshot: HashNode):
+        if loader is not self.save_loader:
+            return
+        self.save_loader = None
+        
+        # only what the editor shows is decoded, the rest stays bytes until written back
+        self.data = data
+        self.splice_source = source
+        self.save_format = source.format
+        self.save_path = loader.path
+        self.save_snapshot = snapshot
+        self.history.reset(data)
+        self.edited_paths.clear()
+        self.update_history_actions()
             
-        self.refresh_ui()
-        self.load_data()
-        self.set_original_values()
+        with self.ui_batch.transaction():
+            self.disable_all_widgets()
+            self.refresh_ui()
+            self.apply_save_view(view)
         self.actionSave_File.setEnabled(True)
+        message = f"Loaded {loader.path.name}"
+        if DEV_FEATURES:
+            message += f" ({self.ui_batch.last_mutations} widget changes)"
+        self.statusBar().showMessage(message)
+    
+    def on_save_load_failed(self, loader: SaveLoader, path: str, message: str):
+        if loader is not self.save_loader:
+            return
+        self.save_loader = None
+        
+        QMessageBox.critical(self, "Load failed", f"Couldn't load {path}\n{message}")
+        self.statusBar().showMessage("Load failed")
+        self.actionSave_File.setEnabled(self.data is not None)
     
     def on_save_button_triggered(self):
         
-        self.save_data()
+        # widgets write their edits into the document as they happen, there is nothing to collect
+        self.record_edit()
+        
+        changes = diff_save(self.save_snapshot, self.data) if self.save_snapshot is not None else []
+        if changes and not self.confirm_changes(changes):
+            return
         
         last = self.settings.value("paths/last_open_dir", "", str)
         if last is None:
@@ -592,19 +676,177 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
         if not path:
             return
         
-        dir_name = os.path.dirname(path)
-        fd, temp_path = tempfile.mkstemp(dir=dir_name)
-
+        self.save_changes = changes
+        # backups are on unless turned off in settings.ini
+        self.start_save_writer(Path(path), self.settings.value("backups/enabled", True, bool))
+
+    def start_save_writer(self, path: Path, backup: bool):
+        mode = self.settings.value("save/mode", DEFAULT_SAVE_MODE, str)
+        backups = self.backups if backup else None
+        writer = SaveWriter(self.data, path, save_format(mode, self.save_format), self.splice_source, backups, self)
+        writer.saveWritten.connect(self.on_save_written)
+        writer.saveFailed.connect(self.on_save_failed)
+        writer.backupFailed.connect(self.on_backup_failed)
+        writer.finished.connect(partial(self.on_save_writer_finished, writer))
+        self.save_writer = writer
+
+        # the writer reads self.data while it encodes, nothing may edit it until it's done
+        self.enable_widgets([self.centralWidget(), self.actionLoad_File, self.actionSave_File, self.actionSelect_Game_Folder], False)
+        self.statusBar().showMessage(f"Saving {path.name}...")
+        writer.start()
+
+    def on_save_written(self, path: str, written: int, seconds: float):
+        self.save_path = Path(path)
+        # what's on disk now is what the next save is diffed against
+        self.save_snapshot = hash_tree(self.data)
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            append_change_log(CHANGE_LOG, self.save_path, self.save_changes)
+        except OSError as e:
+            print(f"Couldn't write {CHANGE_LOG}: {e}")
+        self.save_changes = []
+        self.statusBar().showMessage(f"Saved {os.path.basename(path)} ({written / 1024:.0f} KB in {seconds:.2f}s)")
+        
+    def confirm_changes(self, changes: list[Change]) -> bool:
+        box = QMessageBox(
+            QMessageBox.Icon.Question,
+            "Save changes",
+            f"{len(changes)} value(s) changed since the save was loaded, save them?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            self,
+        )
+        box.setDetailedText(format_changes(changes))
+        return box.exec() == QMessageBox.StandardButton.Yes
+        
+    def on_save_failed(self, path: str, message: str):
+        self.save_changes = []
+        QMessageBox.critical(self, "Save failed", f"Couldn't save {path}\n{message}")
+        self.statusBar().showMessage("Save failed")
+    
+    def on_backup_failed(self, path: str, message: str):
+        # disk full or no permission on the backup folder, the save itself may still go through
+        answer = QMessageBox.question(
+            self,
+            "Backup failed",
+            f"Couldn't back up {path} before overwriting it\n{message}\n\nSave without a backup?",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            self.save_changes = []
+            self.statusBar().showMessage("Save cancelled, nothing was written")
+            return
+        self.start_save_writer(Path(path), False)
+
+    def on_save_writer_finished(self, writer: SaveWriter):
+        writer.deleteLater()
+        # a save retried without a backup is already running
+        if writer is not self.save_writer:
+            return
+        self.save_writer = None
+        self.enable_widgets([self.centralWidget(), self.actionSave_File, self.actionSelect_Game_Folder], True)
+        self.enable_widgets([self.actionLoad_File], templates_ready(self.templates))
+    
+    def setup_save_mode_menu(self):
+        menu = self.menuFile.addMenu("Save Format")
+        group = QActionGroup(self)
+        current = self.settings.value("save/mode", DEFAULT_SAVE_MODE, str)
+        for mode in SAVE_MODES:
+            action = menu.addAction(mode.capitalize())
+            action.setCheckable(True)
+            action.setChecked(mode == current)
+            action.triggered.connect(partial(self.settings.setValue, "save/mode", mode))
+            group.addAction(action)
+
+    def setup_history_menu(self):
+        menu = self.menuBar().addMenu("Edit")
+        self.actionUndo = menu.addAction("Undo")
+        self.actionUndo.setShortcut(QKeySequence.StandardKey.Undo)
+        self.actionUndo.triggered.connect(self.on_undo_triggered)
+        self.actionRedo = menu.addAction("Redo")
+        self.actionRedo.setShortcut(QKeySequence.StandardKey.Redo)
+        self.actionRedo.triggered.connect(self.on_redo_triggered)
+        self.update_history_actions()
+
+    def update_history_actions(self):
+        self.actionUndo.setEnabled(self.history.can_undo())
+        self.actionRedo.setEnabled(self.history.can_redo())
+
+    def on_paths_changed(self, paths: list[DocPath]):
+        self.edited_paths.update(dict.fromkeys(paths))
+
+    def record_edit(self):
+        # whatever changed since the last step becomes one
+        if self.data is None or not self.edited_paths:
+            return
+        paths = list(self.edited_paths)
+        self.edited_paths.clear()
+        self.history.checkpoint(self.data, paths)
+        self.update_history_actions()
 
-            os.replace(temp_path, path)
-        except Exception:
-            os.remove(temp_path)
-            raise
+    def on_undo_triggered(self):
+        if self.data is None or self.save_writer is not None:
+            return
+        # spinbox edits not yet recorded are a step of their own, undone first
+        self.record_edit()
+        changes = self.history.undo(self.data)
+        with self.ui_batch.transaction():
+            self.model.changed([change.path for change in changes])
+        # already hashed by the history, they aren't a new step
+        self.edited_paths.clear()
+        self.update_history_actions()
+        self.statusBar().showMessage(f"Undid {len(changes)} change(s)")
+
+    def on_redo_triggered(self):
+        if self.data is None or self.save_writer is not None:
+            return
+        # edits not yet recorded are a new step, which leaves nothing to redo
+        self.record_edit()
+        changes = self.history.redo(self.data)
+        with self.ui_batch.transaction():
+            self.model.changed([change.path for change in changes])
+        # already hashed by the history, they aren't a new step
+        self.edited_paths.clear()
+        self.update_history_actions()
+        self.statusBar().showMessage(f"Redid {len(changes)} change(s)")
+
+    def setup_backup_menu(self):
+        action = self.menuFile.addAction("Restore Backup...")
+        action.triggered.connect(self.on_restore_backup_triggered)
+
+    def on_restore_backup_triggered(self):
+        if self.save_writer is not None:
+            return
+        if self.save_path is None:
+            self.statusBar().showMessage("Open a save first")
+            return
+        
+        backups = self.backups.list_backups(self.save_path)
+        if not backups:
+            self.statusBar().showMessage(f"No backups of {self.save_path.name}")
+            return
         
-        self.load_data()
+        labels = [f"{index + 1}. {backup.label}" for index, backup in enumerate(backups)]
+        label, ok = QInputDialog.getItem(self, "Restore Backup", f"Backups of {self.save_path.name}", labels, 0, False)
+        if not ok:
+            return
+        
+        # the restored file is loaded over the document, edits not yet saved are lost
+        self.record_edit()
+        changes = diff_save(self.save_snapshot, self.data) if self.save_snapshot is not None else []
+        if changes:
+            answer = QMessageBox.question(
+                self,
+                "Restore Backup",
+                f"{len(changes)} value(s) changed since the save was last loaded or saved, discard them and restore?",
+            )
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+        
+        # the current file is backed up before it's replaced, a restore can be restored away
+        try:
+            self.backups.restore(backups[labels.index(label)], self.save_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Restore failed", f"Couldn't restore {self.save_path}\n{e}")
+            return
+        self.start_save_loader(self.save_path)
 
     def on_game_path_button_triggered(self, saved_path = None):
         if saved_path:
@@ -616,52 +858,119 @@ class SaveEditor(UIHelperMixin, QMainWindow, Ui_MainWindow):
             self.enable_widgets([self.actionLoad_File], False)
             return
         
-        try:
-            self.templates.load_templates(game_path)
-        except TemplateLoadError as e:
-            QMessageBox.critical(
-                self, 
-                "Templates not found",
-                f"Couldn't find templates under the selected folder: {self.templates.missing_templates()}"
-            )
-            self.enable_widgets([self.actionLoad_File], False)
+        # a load still running for a previously picked folder is abandoned
+        if self.template_loader is not None:
+            self.template_loader.cancel()
+        
+        # loaded into a new store, the current one stays in use until the load is done
+        store = TemplateStore(workers=self.templates.workers, full_localization=self.templates.full_localization)
+        loader = TemplateLoader(game_path, store, self.template_cache, self)
+        loader.phaseStarted.connect(partial(self.on_template_phase_started, loader))
+        loader.templatesLoaded.connect(partial(self.on_templates_loaded, loader))
+        loader.loadFailed.connect(partial(self.on_templates_load_failed, loader))
+        loader.finished.connect(partial(self.on_template_loader_finished, loader))
+        self.template_loader = loader
+        
+        self.statusBar().showMessage("Loading templates...")
+        loader.start()
+    
+    def on_template_phase_started(self, loader: TemplateLoader, phase: str, index: int, total: int):
+        if loader is self.template_loader:
+            self.statusBar().showMessage(f"Loading templates: {phase} ({index}/{total})")
+    
+    def on_templates_loaded(self, loader: TemplateLoader, store: TemplateStore):
+        # the signal is queued, the loader may have been cancelled since it was sent
+        if loader is not self.template_loader or loader.is_cancelled():
             return
+        self.template_loader = None
+        self.templates = store
+        game_path = loader.game_path
         
         if templates_ready(self.templates):
+            first_load = self.game_path is None
             self.populate_comboboxes()
             self.populate_dev_tabs()
+            if DEV_FEATURES and first_load and self.data is not None:
+                self.load_data()
             self.settings.setValue("paths/game_dir", game_path.as_posix())
+            self.game_path = game_path
+            self.template_watcher.watch(game_path)
+            timings = format_timings(self.templates.load_timings)
+            if self.templates.load_timings.keys() <= {"Scan"}:
+                # nothing changed since the cache was written, the files were only checked
+                self.statusBar().showMessage(f"Templates loaded from cache ({timings})")
+            else:
+                self.statusBar().showMessage(f"Templates loaded ({timings})")
         
         self.enable_widgets([self.actionLoad_File], True)
 
-    def _is_excluded(self, unit_id):
-        uid = unit_id.lower()
-        return any(sub in uid for sub in EXCLUDED_ID_SUBSTRINGS)
-    
-    def get_unit_loc(self, key, fallback = ""):
-        if self.templates.unit_template is None:
-            return fallback
-        if not isinstance(key, str):
-            return fallback
-        
-        unit = self.templates.unit_template.get(key)
-        if unit is not None:
-            return unit["Name"]
-        return fallback
-    
-    def get_skill_loc(self, key, fallback = ""):
-        if self.templates.skill_template is None:
-            return fallback
-        if not isinstance(key, str):
-            return fallback
-        
-        skill = self.templates.skill_template.get(key)
-        if skill is not None:
-            return skill 
-        else:
-            return fallback
+    def on_templates_load_failed(self, loader: TemplateLoader, store: TemplateStore, message: str):
+        if loader is not self.template_loader or loader.is_cancelled():
+            return
+        self.template_loader = None
+        self.templates = store
+        
+        QMessageBox.critical(
+            self, 
+            "Templates not found",
+            f"Couldn't find templates under the selected folder: {self.templates.missing_templates()}"
+        )
+        self.statusBar().showMessage(message.splitlines()[0])
+        self.enable_widgets([self.actionLoad_File], False)
+    
+    def on_template_loader_finished(self, loader: TemplateLoader):
+        if loader is self.template_loader:
+            # ended without a result, the error was printed by the thread
+            self.template_loader = None
+            self.statusBar().showMessage("Template loading failed")
+        loader.deleteLater()
+    
+    def closeEvent(self, event):
+        # loads still running, even abandoned ones, can't outlive the window
+        for loader in self.findChildren(TemplateLoader):
+            loader.cancel()
+            loader.wait()
+        for loader in self.findChildren(SaveLoader):
+            loader.wait()
+        # a save being written is finished rather than left as a temp file
+        if self.save_writer is not None:
+            self.save_writer.wait()
+        super().closeEvent(event)
+
+    def on_templates_changed(self, folders: list[Path]):
+        # a load in progress watches its folder again once it's done
+        if self.game_path is None or self.template_loader is not None or not templates_ready(self.templates):
+            return
+        
+        try:
+            changes = self.templates.refresh(
+                self.game_path,
+                [folder for folder in folders if folder in TEMPLATE_FOLDERS]
+            )
+        except (OSError, ValueError, KeyError, TemplateLoadError) as e:
+            # usually a file caught halfway through being written, the next change retries
+            self.statusBar().showMessage(f"Template reload failed: {e}")
+            return
+        
+        if not changes:
+            return
+        
+        self.template_cache.write(self.game_path, self.templates.cache_state())
+        self.refresh_template_combos(changes)
+        # the inspectors may hold templates and a loc store the refresh replaced
+        self.populate_dev_tabs()
+        self.statusBar().showMessage(f"Reloaded {len(changes.files)} changed template file(s)")
+    
+    def refresh_template_combos(self, changes: TemplateChanges):
+        # only items of units and skills that changed are touched
+        if changes.units:
+            self.unit_items.update(self.templates.unit_template, changes.units)
+        if changes.skills:
+            self.skill_items.update(self.templates.skill_template, changes.skills)
 
 if __name__ == "__main__":
+    # template ingestion uses worker processes, needed for frozen builds
+    multiprocessing.freeze_support()
 
     app = QApplication(sys.argv)
     icon = QIcon(resource_path("assets/icon.ico"))
@@ -0,0 +1,237 @@
+import json
+from typing import Any, Iterator, Optional, Union
+from constants import NEW_LEADER_TEMPLATE
+from save_intern import writable
+from save_splice import RawJson
+
+# Views over the dicts of a save. They hold the dict itself, reads and writes go straight to it,
+# so a view can be made, dropped and made again for free and never goes stale.
+# A view that's written through holds a private dict, like SaveModel.writable returns, whatever
+# it changes below that dict is made writable first, see save_intern. Reads never copy anything.
+
+_NUMBER = (int, float)
+
+class _Field():
+    """A member of the wrapped dict as an attribute, writes are type checked."""
+
+    __slots__ = ("key", "kinds", "optional", "name")
+
+    def __init__(self, key: str, kinds: Union[type, tuple[type, ...]], optional: bool = False):
+        self.key = key
+        self.kinds = kinds if isinstance(kinds, tuple) else (kinds,)
+        self.optional = optional
+
+    def __set_name__(self, owner, name: str):
+        self.name = f"{owner.__name__}.{name}"
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        value = view.data[self.key]
+        # members off the edited paths are still bytes, see save_splice
+        return value.decode() if isinstance(value, RawJson) else value
+
+    def __set__(self, view, value):
+        # bool is an int to isinstance, not to the game
+        valid = isinstance(value, self.kinds) and (bool in self.kinds or not isinstance(value, bool))
+        if not valid and not (self.optional and value is None):
+            kinds = " or ".join(kind.__name__ for kind in self.kinds)
+            raise TypeError(f"{self.name} must be {kinds}, not {type(value).__name__}")
+        view._writable()[self.key] = value
+
+class _View():
+    __slots__ = ("data",)
+
+    def __init__(self, data: dict[str, Any]):
+        self.data = data
+
+    def _writable(self, *path) -> Any:
+        # the container at path below data, for a setter to change
+        return writable(self.data, path)
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and other.data is self.data
+
+    def __hash__(self) -> int:
+        return id(self.data)
+
+    def __repr__(self) -> str:
+        name = self.data.get("Name", "")
+        return f"{type(self).__name__}({name.decode() if isinstance(name, RawJson) else name!r})"
+
+def _wrap(view_type, data: Optional[dict[str, Any]]):
+    return None if data is None else view_type(data)
+
+def _unwrap(view: Optional[_View]) -> Optional[dict[str, Any]]:
+    return None if view is None else view.data
+
+class Inventory(_View):
+    """InventorySave of a regiment, each slot holds an ItemSave or None."""
+
+    __slots__ = ("regiment",)
+
+    def __init__(self, data: dict[str, Any], regiment: Optional[dict[str, Any]] = None):
+        super().__init__(data)
+        # the dict data is the InventorySave of, a shared inventory is copied into it on the first write
+        self.regiment = regiment
+
+    def _writable(self, *path) -> Any:
+        if self.regiment is not None:
+            self.data = writable(self.regiment, ("InventorySave",))
+        return writable(self.data, path)
+
+    locked_offhand_slots = _Field("LockedOffHandSlots", list)
+
+    @property
+    def melee_weapon(self) -> Optional[dict[str, Any]]:
+        return self.data["MeleeWeaponSlot"]["ItemSave"]
+
+    @melee_weapon.setter
+    def melee_weapon(self, item: Optional[dict[str, Any]]):
+        self._writable("MeleeWeaponSlot")["ItemSave"] = item
+
+    @property
+    def ranged_weapon(self) -> Optional[dict[str, Any]]:
+        return self.data["RangedWeaponSlot"]["ItemSave"]
+
+    @ranged_weapon.setter
+    def ranged_weapon(self, item: Optional[dict[str, Any]]):
+        self._writable("RangedWeaponSlot")["ItemSave"] = item
+
+    @property
+    def backpack(self) -> Optional[dict[str, Any]]:
+        return self.data["BackpackSlot"]["ItemSave"]
+
+    @backpack.setter
+    def backpack(self, item: Optional[dict[str, Any]]):
+        self._writable("BackpackSlot")["ItemSave"] = item
+
+    @property
+    def offhand_items(self) -> list[Optional[dict[str, Any]]]:
+        return [slot["ItemSave"] for slot in self.data["OffhandSlots"]]
+
+    def set_offhand_item(self, index: int, item: Optional[dict[str, Any]]):
+        self._writable("OffhandSlots", index)["ItemSave"] = item
+
+    def items(self) -> Iterator[dict[str, Any]]:
+        # every item held, empty slots skipped
+        slots = [self.data["MeleeWeaponSlot"], self.data["RangedWeaponSlot"], self.data["BackpackSlot"]]
+        for slot in (*slots, *self.data["OffhandSlots"], *self.data["BackpackSlots"]):
+            if slot.get("ItemSave") is not None:
+                yield slot["ItemSave"]
+
+class Regiment(_View):
+    __slots__ = ()
+
+    unit_id = _Field("UnitID", str)
+    name = _Field("Name", str)
+    level = _Field("CurrentLevel", int)
+    experience = _Field("CurrentExperience", int)
+    manpower = _Field("Manpower", int)
+    max_manpower = _Field("MaxManpower", int)
+    target_manpower = _Field("TargetManpower", int)
+    supply = _Field("Supply", int)
+    division_position = _Field("DivisionPosition", int)
+    upgrade_tree_id = _Field("UpgradeTreeID", str, optional=True)
+    previous_unlocked_units = _Field("PreviousUnlockedUnits", list)
+    # stats come from unit templates, where some are floats
+    melee = _Field("MeleeAttribute", _NUMBER)
+    accuracy = _Field("AccuracyAttribute", _NUMBER)
+    reload = _Field("ReloadAttribute", _NUMBER)
+    morale = _Field("MoraleAttribute", _NUMBER)
+    fatigue = _Field("FatigueAttribute", _NUMBER)
+    charge_bonus = _Field("ChargeBonusAttribute", int)
+    walk_speed = _Field("WalkSpeed", int)
+    run_speed = _Field("RunSpeed", int)
+    bust = _Field("BustData", dict)
+    flag = _Field("FlagSave", dict)
+
+    @property
+    def inventory(self) -> Inventory:
+        # writable when the regiment is, its setters copy a shared InventorySave first
+        return Inventory(self.data["InventorySave"], self.data)
+
+class Officer(_View):
+    __slots__ = ()
+
+    first_name = _Field("Name", str)
+    last_name = _Field("LastName", str)
+    level = _Field("Level", int)
+    experience = _Field("Experience", int)
+    skill_points = _Field("SkillPointsAvailable", int)
+    skills = _Field("SkillSaves", list)
+
+    @classmethod
+    def new(cls) -> "Officer":
+        # a fresh dict every time, officers made from one template must not share it
+        return cls(json.loads(NEW_LEADER_TEMPLATE))
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}"
+
+class Division(_View):
+    __slots__ = ()
+
+    name = _Field("Name", str)
+
+    @property
+    def officer(self) -> Optional[Officer]:
+        return _wrap(Officer, self.data["OfficerSave"])
+
+    @officer.setter
+    def officer(self, officer: Optional[Officer]):
+        self._writable()["OfficerSave"] = _unwrap(officer)
+
+    @property
+    def regiments(self) -> list[Optional[Regiment]]:
+        # by position, None where the slot is empty
+        return [_wrap(Regiment, item) for item in self.data["Regiments"]]
+
+    def set_regiment(self, position: int, regiment: Optional[Regiment]):
+        self._writable("Regiments")[position] = _unwrap(regiment)
+
+class Army(_View):
+    """ArmySaveData of a save."""
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, save: dict[str, Any]) -> "Army":
+        return cls(save["PlayerSaveData"]["ArmySaveData"])
+
+    @property
+    def divisions(self) -> list[Division]:
+        return [Division(item) for item in self.data["Divisions"]]
+
+    @property
+    def reserve_regiments(self) -> list[Optional[Regiment]]:
+        return [_wrap(Regiment, item) for item in self.data["ReserveRegiments"]]
+
+    def set_reserve_regiment(self, index: int, regiment: Optional[Regiment]):
+        self._writable("ReserveRegiments")[index] = _unwrap(regiment)
+
+    @property
+    def reserve_officers(self) -> list[Optional[Officer]]:
+        return [_wrap(Officer, item) for item in self.data["ReserveOfficers"]]
+
+    def set_reserve_officer(self, index: int, officer: Optional[Officer]):
+        self._writable("ReserveOfficers")[index] = _unwrap(officer)
+
+    def regiments(self) -> Iterator[Regiment]:
+        # every regiment, divisions first, empty slots skipped
+        for division in self.data["Divisions"]:
+            for item in division["Regiments"]:
+                if item is not None:
+                    yield Regiment(item)
+        for item in self.data["ReserveRegiments"]:
+            if item is not None:
+                yield Regiment(item)
+
+    def officers(self) -> Iterator[Officer]:
+        for division in self.data["Divisions"]:
+            if division["OfficerSave"] is not None:
+                yield Officer(division["OfficerSave"])
+        for item in self.data["ReserveOfficers"]:
+            if item is not None:
+                yield Officer(item)
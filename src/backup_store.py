@@ -0,0 +1,243 @@
+import argparse
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+import os
+from pathlib import Path
+import re
+import tempfile
+import time
+from typing import Iterator, Optional
+import zlib
+from constants import BACKUP_DIR
+from json_backend import dumps, loads
+
+# Saves are cut into chunks at content defined points, so an edit only changes the chunks
+# around it and every other chunk is shared with the previous backups. Chunks are stored
+# once under their sha256, compressed, and each backup is a manifest listing its chunks.
+
+# chunk size bounds in bytes, a cut is forced at MAX_CHUNK
+MIN_CHUNK = 2 * 1024
+MAX_CHUNK = 64 * 1024
+# bytes before a cut candidate that decide whether it's cut, 1 in CUT_MASK + 1 candidates is
+CUT_WINDOW = 48
+CUT_MASK = 0x3F
+# end of an object, in a save that's frequent and always a sensible place to cut
+_CUT_CANDIDATE = re.compile(rb"\}")
+
+COMPRESS_LEVEL = 6
+
+def chunk_bounds(data: bytes) -> Iterator[tuple[int, int]]:
+    # the same bytes around a candidate give the same cut wherever they sit in the file
+    start = 0
+    size = len(data)
+    while size - start > MIN_CHUNK:
+        cut = None
+        for match in _CUT_CANDIDATE.finditer(data, start + MIN_CHUNK, min(size, start + MAX_CHUNK)):
+            end = match.end()
+            if zlib.crc32(data[end - CUT_WINDOW:end]) & CUT_MASK == 0:
+                cut = end
+                break
+        if cut is None:
+            cut = min(size, start + MAX_CHUNK)
+        yield start, cut
+        start = cut
+    if start < size:
+        yield start, size
+
+@dataclass
+class Backup():
+    # manifest file, identifies the backup
+    manifest: Path
+    source: str
+    created: float
+    size: int
+    sha256: str
+    chunks: list[str]
+
+    @property
+    def label(self) -> str:
+        return f"{datetime.fromtimestamp(self.created):%Y-%m-%d %H:%M:%S}  {self.size / 1024:.0f} KB"
+
+@dataclass
+class RetentionPolicy():
+    # newest backups of each save always kept
+    keep_last: int = 20
+    # beyond those, the newest backup of each of the last keep_days days
+    keep_days: int = 30
+
+class BackupStore():
+    """Deduplicated, compressed history of every save the editor overwrote."""
+
+    def __init__(self, root: Path = BACKUP_DIR, policy: Optional[RetentionPolicy] = None):
+        self.root = Path(root)
+        self.policy = RetentionPolicy() if policy is None else policy
+
+    @property
+    def chunk_dir(self) -> Path:
+        return self.root / "chunks"
+
+    @property
+    def manifest_dir(self) -> Path:
+        return self.root / "manifests"
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+
+    def _save_dir(self, source: Path) -> Path:
+        # versions of one save are grouped by its absolute path
+        source = Path(source).resolve()
+        key = hashlib.blake2b(source.as_posix().encode("utf-8"), digest_size=6).hexdigest()
+        return self.manifest_dir / f"{source.stem}-{key}"
+
+    def _write_atomic(self, path: Path, payload: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent)
+        try:
+            with open(fd, "wb") as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(temp_path)
+            raise
+
+    def backup(self, source: Path) -> Optional[Backup]:
+        # stores the current content of source, None if it doesn't exist or the last backup already has it
+        try:
+            with open(source, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        digest = hashlib.sha256(data).hexdigest()
+        history = self.list_backups(source)
+        if history and history[0].sha256 == digest:
+            return None
+
+        chunks = []
+        for start, end in chunk_bounds(data):
+            piece = data[start:end]
+            chunk_digest = hashlib.sha256(piece).hexdigest()
+            chunk_path = self._chunk_path(chunk_digest)
+            if not chunk_path.exists():
+                self._write_atomic(chunk_path, zlib.compress(piece, COMPRESS_LEVEL))
+            chunks.append(chunk_digest)
+
+        created = time.time()
+        save_dir = self._save_dir(source)
+        manifest = save_dir / f"{int(created * 1000)}.json"
+        while manifest.exists():
+            created += 0.001
+            manifest = save_dir / f"{int(created * 1000)}.json"
+
+        backup = Backup(manifest, Path(source).resolve().as_posix(), created, len(data), digest, chunks)
+        self._write_atomic(manifest, dumps({
+            "source": backup.source,
+            "created": backup.created,
+            "size": backup.size,
+            "sha256": backup.sha256,
+            "chunks": backup.chunks,
+        }).encode("utf-8"))
+        self.prune(source)
+        return backup
+
+    def _read_manifest(self, manifest: Path) -> Optional[Backup]:
+        try:
+            with open(manifest, "rb") as f:
+                entry = loads(f.read())
+            return Backup(manifest, entry["source"], entry["created"], entry["size"], entry["sha256"], entry["chunks"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # half written or hand edited, it just doesn't show up
+            return None
+
+    def list_backups(self, source: Optional[Path] = None) -> list[Backup]:
+        # newest first, every save when source is None
+        if source is None:
+            manifests = self.manifest_dir.glob("*/*.json")
+        else:
+            manifests = self._save_dir(source).glob("*.json")
+        backups = [backup for backup in map(self._read_manifest, manifests) if backup is not None]
+        backups.sort(key=lambda backup: backup.created, reverse=True)
+        return backups
+
+    def read(self, backup: Backup) -> bytes:
+        data = b"".join(zlib.decompress(self._chunk_path(digest).read_bytes()) for digest in backup.chunks)
+        if hashlib.sha256(data).hexdigest() != backup.sha256:
+            raise ValueError(f"Backup {backup.manifest.name} is damaged")
+        return data
+
+    def restore(self, backup: Backup, target: Optional[Path] = None):
+        # the file being replaced is backed up first, a restore can be undone
+        target = Path(backup.source if target is None else target)
+        data = self.read(backup)
+        self.backup(target)
+        self._write_atomic(target, data)
+
+    def prune(self, source: Optional[Path] = None):
+        # drops backups the policy doesn't keep, then chunks no backup uses anymore
+        backups = self.list_backups(source)
+        by_save: dict[Path, list[Backup]] = {}
+        for backup in backups:
+            by_save.setdefault(backup.manifest.parent, []).append(backup)
+
+        removed = False
+        for history in by_save.values():
+            daily = self._kept_daily(history)
+            for backup in history[self.policy.keep_last:]:
+                if backup not in daily:
+                    with suppress(OSError):
+                        backup.manifest.unlink()
+                        removed = True
+        if removed:
+            self.collect_garbage()
+
+    def _kept_daily(self, history: list[Backup]) -> list[Backup]:
+        # history is newest first, the first one seen for a day is that day's newest
+        cutoff = time.time() - self.policy.keep_days * 86400
+        kept: dict[str, Backup] = {}
+        for backup in history:
+            if backup.created < cutoff:
+                break
+            kept.setdefault(datetime.fromtimestamp(backup.created).strftime("%Y-%m-%d"), backup)
+        return list(kept.values())
+
+    def collect_garbage(self):
+        used = {digest for backup in self.list_backups() for digest in backup.chunks}
+        for chunk in self.chunk_dir.glob("*/*"):
+            if chunk.name not in used:
+                with suppress(OSError):
+                    chunk.unlink()
+
+    def disk_usage(self) -> int:
+        return sum(file.stat().st_size for file in self.root.rglob("*") if file.is_file())
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="List, restore and prune save backups.")
+    parser.add_argument("--root", type=Path, default=BACKUP_DIR, help="backup folder")
+    commands = parser.add_subparsers(dest="command", required=True)
+    list_command = commands.add_parser("list", help="backups of a save, or of every save")
+    list_command.add_argument("save", nargs="?", type=Path)
+    restore_command = commands.add_parser("restore", help="restore a backup listed by 'list'")
+    restore_command.add_argument("save", type=Path)
+    restore_command.add_argument("index", type=int, help="0 is the newest backup")
+    restore_command.add_argument("--to", type=Path, help="write somewhere else than the save")
+    commands.add_parser("prune", help="apply the retention policy")
+    args = parser.parse_args(argv)
+
+    store = BackupStore(args.root)
+    if args.command == "list":
+        for index, backup in enumerate(store.list_backups(args.save)):
+            print(f"{index:>4}  {backup.label}  {backup.source}")
+        print(f"{store.disk_usage() / 1024:.0f} KB on disk")
+    elif args.command == "restore":
+        backups = store.list_backups(args.save)
+        if not 0 <= args.index < len(backups):
+            parser.error(f"no backup {args.index} for {args.save}")
+        store.restore(backups[args.index], args.to or args.save)
+    else:
+        store.prune()
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,11 @@ from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 SETTINGS = BASE_DIR / "settings.ini"
+TEMPLATE_CACHE = BASE_DIR / "templates.cache"
+# every version of a save from before the editor overwrote it, see backup_store
+BACKUP_DIR = BASE_DIR / "backups"
+# what every save written by the editor changed, see save_diff
+CHANGE_LOG = BASE_DIR / "changes.log"
 VERSION = "1.0.0"
 
 GAME_DIR = Path("Master Of Command_Data/StreamingAssets/GameData")
@@ -14,6 +19,9 @@ FLAG_DIR = GAME_DIR / "General/FlagTemplates.json"
 BUST_DIR = GAME_DIR / "Busts"
 UPGRADE_DIR = GAME_DIR / "Campaign/UpgradeTrees.json"
 
+# decoded bust templates kept in memory, the rest are read again on demand
+BUST_CACHE_SIZE = 64
+
 TYPE_MAP = {
     "RECRUIT_INFANTRY": "INFANTRY",
     "RECRUIT_LIGHT_CAVALRY": "CAVALRY",
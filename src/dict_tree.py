@@ -0,0 +1,211 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterator, Optional, Union
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, QPersistentModelIndex, Qt
+
+# children made per fetchMore, a view asks for more as it scrolls
+FETCH_BATCH = 256
+
+PathKey = Any
+
+# value of a node not read from its parent yet
+_UNREAD = object()
+
+def _is_container(value: Any) -> bool:
+    # templates may be mappings that decode entries as they're read, like LazyTemplateFolder
+    return isinstance(value, (Mapping, Sequence)) and not isinstance(value, (str, bytes))
+
+def _child(value: Any, key: PathKey) -> Any:
+    # _UNREAD for an entry a lazy mapping hasn't decoded, a search never decodes anything
+    peek = getattr(value, "peek", None)
+    if peek is None:
+        return value[key]
+    if key not in value:
+        raise KeyError(key)
+    return peek(key, _UNREAD)
+
+def _items(value: Any) -> Iterator[tuple[PathKey, Any]]:
+    if not isinstance(value, Mapping):
+        return enumerate(value)
+    if getattr(value, "peek", None) is None:
+        return iter(value.items())
+    return ((key, value.peek(key, _UNREAD)) for key in value)
+
+class _Node():
+    __slots__ = ("parent", "row", "key", "_value", "keys", "children")
+
+    def __init__(self, parent: Optional["_Node"], row: int, key: PathKey, value: Any = _UNREAD):
+        self.parent = parent
+        self.row = row
+        self.key = key
+        self._value = value
+        # key of every child, listed on the first fetch
+        self.keys: Optional[Union[list[PathKey], range]] = None
+        self.children: list["_Node"] = []
+
+    @property
+    def value(self) -> Any:
+        # read when the row is first painted or expanded, a lazy mapping decodes it only then
+        if self._value is _UNREAD:
+            self._value = self.parent.value[self.key]
+        return self._value
+
+    def is_container(self) -> bool:
+        return _is_container(self.value) and len(self.value) > 0
+
+    def child_keys(self) -> Union[list[PathKey], range]:
+        if self.keys is None:
+            self.keys = list(self.value) if isinstance(self.value, Mapping) else range(len(self.value))
+        return self.keys
+
+    def can_fetch(self) -> bool:
+        return self.is_container() and len(self.children) < len(self.child_keys())
+
+def _key_text(key: PathKey) -> str:
+    return f"[{key}]" if isinstance(key, int) else str(key)
+
+def _value_text(value: Any) -> str:
+    return "" if _is_container(value) else str(value)
+
+class DictTreeModel(QAbstractItemModel):
+    """Read only key/value tree over nested mappings and lists, for the template inspectors.
+
+    Nodes are made only for what's been expanded, in batches as the view scrolls, the dicts
+    themselves are never copied into Qt items.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = _Node(None, 0, None, {})
+        # last search and the paths it matched, a longer query only rechecks those
+        self._query = ""
+        self._matches: list[tuple[PathKey, ...]] = []
+
+    def set_data(self, data: Optional[Mapping[str, Any]]):
+        self.beginResetModel()
+        self._root = _Node(None, 0, None, data or {})
+        self._query = ""
+        self._matches = []
+        self.endResetModel()
+
+    def _node(self, index: QModelIndex | QPersistentModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        node = self._node(parent)
+        if not 0 <= row < len(node.children) or not 0 <= column < 2:
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 2
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        # before the first fetch too, so the view shows an expander
+        if parent.isValid() and parent.column() != 0:
+            return False
+        return self._node(parent).is_container()
+
+    def canFetchMore(self, parent: QModelIndex | QPersistentModelIndex) -> bool:
+        return self._node(parent).can_fetch()
+
+    def fetchMore(self, parent: QModelIndex | QPersistentModelIndex):
+        self._fetch(parent, FETCH_BATCH)
+
+    def _fetch(self, parent: QModelIndex | QPersistentModelIndex, count: int):
+        node = self._node(parent)
+        keys = node.child_keys()
+        start = len(node.children)
+        end = min(start + count, len(keys))
+        if end <= start:
+            return
+        self.beginInsertRows(parent, start, end - 1)
+        node.children.extend(_Node(node, row, keys[row]) for row in range(start, end))
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        node = index.internalPointer()
+        return _key_text(node.key) if index.column() == 0 else _value_text(node.value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return ("Key", "Value")[section]
+        return None
+
+    def flags(self, index: QModelIndex | QPersistentModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def find(self, text: str) -> list[tuple[PathKey, ...]]:
+        # paths whose key or value contains text, in tree order, case insensitive
+        # the query usually grows a letter at a time, the matches of a query are the only
+        # candidates for any query containing it
+        query = text.casefold()
+        if query == self._query:
+            return self._matches
+        if not query:
+            matches = []
+        elif self._query and self._query in query:
+            matches = [path for path in self._matches if self._path_matches(path, query)]
+        else:
+            matches = list(self._walk(self._root.value, (), query))
+        self._query, self._matches = query, matches
+        return matches
+
+    def _walk(self, value: Any, path: tuple[PathKey, ...], query: str) -> Iterator[tuple[PathKey, ...]]:
+        # entries of a lazy mapping not decoded yet only match by key
+        for key, item in _items(value):
+            item_path = path + (key,)
+            unread = item is _UNREAD
+            if query in _key_text(key).casefold() or (not unread and query in _value_text(item).casefold()):
+                yield item_path
+            if not unread and _is_container(item):
+                yield from self._walk(item, item_path, query)
+
+    def _path_matches(self, path: tuple[PathKey, ...], query: str) -> bool:
+        value = self._root.value
+        try:
+            for key in path[:-1]:
+                value = _child(value, key)
+                if value is _UNREAD:
+                    # dropped from the lazy mapping since the last search, it isn't decoded again
+                    return False
+            value = _child(value, path[-1])
+        except (KeyError, IndexError, TypeError):
+            # gone since the last search, a template reloaded in place
+            return False
+        if query in _key_text(path[-1]).casefold():
+            return True
+        return value is not _UNREAD and query in _value_text(value).casefold()
+
+    def index_of(self, path: tuple[PathKey, ...]) -> QModelIndex:
+        # fetches what's needed along path, an invalid index if it isn't in the data
+        index = QModelIndex()
+        node = self._root
+        for key in path:
+            if not node.is_container():
+                return QModelIndex()
+            keys = node.child_keys()
+            if key not in keys:
+                return QModelIndex()
+            row = keys.index(key)
+            if row >= len(node.children):
+                self._fetch(index, row + 1 - len(node.children))
+            node = node.children[row]
+            index = self.createIndex(row, 0, node)
+        return index
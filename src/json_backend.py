@@ -0,0 +1,174 @@
+import argparse
+import json
+from pathlib import Path
+import sys
+import time
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+# One place for every JSON decode/encode in the editor. A faster backend is used
+# when installed, saves are only written by a backend whose output is identical to
+# the stdlib encoder, so a save written here matches one written by json.dump.
+
+JsonInput = Union[bytes, bytearray, memoryview, str]
+# spaces or the indent string itself, None is compact
+Indent = Union[int, str, None]
+
+class JsonBackend(NamedTuple):
+    name: str
+    loads: Callable[[JsonInput], Any]
+    # dumps(obj, indent) -> text, same layout as json.dumps(obj, indent=indent, ensure_ascii=False)
+    dumps: Callable[[Any, Indent], str]
+    # True when dumps matched stdlib byte for byte on PROBE
+    exact: bool = False
+
+def _stdlib_loads(data: JsonInput) -> Any:
+    # explicit utf-8, json.loads on bytes would also guess utf-16/32
+    if not isinstance(data, str):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+def _stdlib_dumps(obj: Any, indent: Indent = None) -> str:
+    if indent is None:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
+
+STDLIB = JsonBackend("json", _stdlib_loads, _stdlib_dumps, exact=True)
+
+# values where encoders usually disagree: float formatting, escapes, big ints, empty containers
+PROBE = {
+    "floats": [0.1, 1.5, 100.0, -0.0, 1e-05, 1e-07, 0.0001, 1e15, 1e16, 1e+22, 123456789.123, 5e-324],
+    "ints": [0, -1, 2**31, 2**63 - 1, -(2**63)],
+    "text": ["", "plain", "é ü 中文", "quote \" backslash \\ slash /", "\n\r\t\b\f", "\x00\x1f\x7f", "  "],
+    "empty": [{}, [], {"nested": [[], {}]}],
+    "literals": [True, False, None],
+}
+
+def _probe_exact(dumps: Callable[[Any, Indent], str]) -> bool:
+    try:
+        return all(dumps(PROBE, indent) == _stdlib_dumps(PROBE, indent) for indent in (None, 2))
+    except Exception:
+        return False
+
+def _orjson_backend() -> Optional[JsonBackend]:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    def loads(data: JsonInput) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return orjson.loads(data)
+
+    def dumps(obj: Any, indent: Indent = None) -> str:
+        # orjson only knows 2 space indentation
+        if indent not in (None, 2):
+            return _stdlib_dumps(obj, indent)
+        option = orjson.OPT_INDENT_2 if indent == 2 else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+
+    return JsonBackend("orjson", loads, dumps, _probe_exact(dumps))
+
+def available_backends() -> dict[str, JsonBackend]:
+    backends = {STDLIB.name: STDLIB}
+    for factory in (_orjson_backend,):
+        backend = factory()
+        if backend is not None:
+            backends[backend.name] = backend
+    return backends
+
+BACKENDS = available_backends()
+
+_backend = STDLIB
+_writer = STDLIB
+
+def select_backend(name: Optional[str] = None) -> JsonBackend:
+    # no name (or an unknown one) picks the last registered backend, the fastest available
+    global _backend, _writer
+    _backend = BACKENDS.get(name) or list(BACKENDS.values())[-1]
+    _writer = _backend if _backend.exact else STDLIB
+    return _backend
+
+def current_backend() -> JsonBackend:
+    return _backend
+
+def loads(data: JsonInput) -> Any:
+    if _backend is STDLIB:
+        return _stdlib_loads(data)
+    try:
+        return _backend.loads(data)
+    except (ValueError, TypeError):
+        # stdlib is more lenient (NaN, huge ints), anything it rejects still raises its JSONDecodeError
+        return _stdlib_loads(data)
+
+def dumps(obj: Any, indent: Indent = None) -> str:
+    # only ever encoded by an exact backend, output is what json.dumps(..., ensure_ascii=False) gives
+    try:
+        return _writer.dumps(obj, indent)
+    except (TypeError, ValueError, OverflowError):
+        if _writer is STDLIB:
+            raise
+        return _stdlib_dumps(obj, indent)
+
+def load_file(file: Path) -> Any:
+    with open(file, "rb") as f:
+        return loads(f.read())
+
+select_backend()
+
+def _time_best(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _benchmark_files(game_path: Optional[Path], saves: list[Path]) -> list[Path]:
+    files = list(saves)
+    if game_path is not None:
+        from constants import BUST_DIR, FLAG_DIR, LOC_DIR, QUESTS_DIR, SKILLS_DIR, UNITS_DIR, UPGRADE_DIR
+        files += [game_path / file for file in (UNITS_DIR, UPGRADE_DIR, FLAG_DIR, LOC_DIR)]
+        # folders are many small files, a few of each is enough for a throughput figure
+        for folder in (BUST_DIR, QUESTS_DIR, SKILLS_DIR):
+            files += sorted((game_path / folder).glob("*.json"))[:5]
+    return [file for file in files if file.is_file()]
+
+def benchmark(files: list[Path], repeat: int = 5, out=sys.stdout):
+    print(f"{'file':<40} {'backend':<8} {'MB':>8} {'decode MB/s':>12} {'encode MB/s':>12} {'exact':>6}", file=out)
+    for file in files:
+        raw = file.read_bytes()
+        size = len(raw) / 1_000_000
+        obj = _stdlib_loads(raw)
+        expected = _stdlib_dumps(obj, 2)
+
+        for backend in BACKENDS.values():
+            try:
+                decode = _time_best(lambda: backend.loads(raw), repeat)
+                encode = _time_best(lambda: backend.dumps(obj, 2), repeat)
+                exact = "yes" if backend.dumps(obj, 2) == expected else "no"
+            except Exception as e:
+                print(f"{file.name:<40} {backend.name:<8} {size:>8.2f} failed: {e}", file=out)
+                continue
+            print(
+                f"{file.name:<40} {backend.name:<8} {size:>8.2f} "
+                f"{size / decode:>12.1f} {size / encode:>12.1f} {exact:>6}",
+                file=out,
+            )
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare JSON backends on save files and game templates.")
+    parser.add_argument("saves", nargs="*", type=Path, help=".fcs save files")
+    parser.add_argument("--game", type=Path, help="Master of Command install folder, adds the game templates")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement, the best one is kept")
+    args = parser.parse_args(argv)
+
+    files = _benchmark_files(args.game, args.saves)
+    if not files:
+        parser.error("no files to benchmark, pass save files and/or --game")
+
+    print(f"backends: {', '.join(BACKENDS)}, active: {_backend.name}, saves written by: {_writer.name}")
+    benchmark(files, max(1, args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import json
+import re
+from typing import Any, Generator, Iterator, Optional, Union
+from json_backend import loads
+
+# Walks raw JSON bytes without building Python objects, values are only
+# decoded when asked for. Used to pull a few fields out of large documents.
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb"[^,:\]}\s]+")
+# a whole string or a single bracket, strings are matched whole so brackets inside them are skipped
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+
+# containers nested up to this deep are matched by a single regex, deeper ones count brackets in python
+_MAX_NESTING = 32
+
+def _container_pattern(depth: int) -> bytes:
+    string = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+    pattern = rb'[\[{](?:[^"\[\]{}]++|' + string + rb')*+[\]}]'
+    for _ in range(depth - 1):
+        pattern = rb'[\[{](?:[^"\[\]{}]++|' + string + rb'|' + pattern + rb')*+[\]}]'
+    return pattern
+
+_CONTAINER = re.compile(_container_pattern(_MAX_NESTING), re.DOTALL)
+
+PathPart = Union[str, int]
+
+def _error(buf, message: str, pos: int) -> json.JSONDecodeError:
+    return json.JSONDecodeError(message, bytes(buf).decode("utf-8", "replace"), pos)
+
+def skip_whitespace(buf, pos: int) -> int:
+    return _WHITESPACE.match(buf, pos).end()
+
+def skip_value(buf, pos: int) -> int:
+    # returns the offset right after the value starting at pos
+    pos = skip_whitespace(buf, pos)
+    if pos >= len(buf):
+        raise _error(buf, "Expecting value", pos)
+
+    first = buf[pos]
+    if first == 0x22:  # "
+        match = _STRING.match(buf, pos)
+        if match is None:
+            raise _error(buf, "Unterminated string", pos)
+        return match.end()
+
+    if first == 0x7B or first == 0x5B:  # { [
+        match = _CONTAINER.match(buf, pos)
+        if match is not None:
+            return match.end()
+
+        # too deep for the regex or malformed, the slow walk also finds the error
+        depth = 0
+        for match in _TOKEN.finditer(buf, pos):
+            char = buf[match.start()]
+            if char == 0x22:
+                continue
+            depth += 1 if char == 0x7B or char == 0x5B else -1
+            if depth == 0:
+                return match.end()
+        raise _error(buf, "Unterminated container", pos)
+
+    match = _SCALAR.match(buf, pos)
+    if match is None:
+        raise _error(buf, "Expecting value", pos)
+    return match.end()
+
+def skip_indented(buf: bytes, pos: int, margin: bytes) -> Optional[int]:
+    # pretty printed documents only: the container at pos ends on the first line that is
+    # margin (newline and the indentation of its depth) followed by its closing bracket
+    # None when that doesn't hold up, skip_value is the fallback
+    closer = b"}" if buf[pos] == 0x7B else b"]"
+    if buf[pos + 1:pos + 2] == closer:
+        return pos + 2
+
+    end = buf.find(margin + closer, pos)
+    if end < 0:
+        return None
+    end += len(margin) + 1
+    # a bracket inside a string can unbalance the counts, any doubt goes the slow way
+    if buf.count(b"{", pos, end) != buf.count(b"}", pos, end):
+        return None
+    if buf.count(b"[", pos, end) != buf.count(b"]", pos, end):
+        return None
+    return end
+
+def decode_span(buf, start: int, end: int) -> Any:
+    return loads(buf[start:end])
+
+def _decode_key(buf, start: int, end: int) -> str:
+    raw = bytes(buf[start + 1:end - 1])
+    if b"\\" in raw:
+        return json.loads(bytes(buf[start:end]).decode("utf-8"))
+    return raw.decode("utf-8")
+
+def member_starts(buf, pos: int = 0) -> Generator[tuple[str, int], Optional[int], None]:
+    # yields (key, value start) for each member of the object at pos
+    # a value is only skipped once iteration moves past it, send() its end if already known
+    pos = skip_whitespace(buf, pos)
+    if buf[pos:pos + 1] != b"{":
+        raise _error(buf, "Expecting object", pos)
+    pos = skip_whitespace(buf, pos + 1)
+    if buf[pos:pos + 1] == b"}":
+        return
+
+    while True:
+        key_match = _STRING.match(buf, pos)
+        if key_match is None:
+            raise _error(buf, "Expecting property name enclosed in double quotes", pos)
+        key = _decode_key(buf, key_match.start(), key_match.end())
+
+        pos = skip_whitespace(buf, key_match.end())
+        if buf[pos:pos + 1] != b":":
+            raise _error(buf, "Expecting ':' delimiter", pos)
+        start = skip_whitespace(buf, pos + 1)
+        end = yield key, start
+        if end is None:
+            end = skip_value(buf, start)
+
+        pos = skip_whitespace(buf, end)
+        delimiter = buf[pos:pos + 1]
+        if delimiter == b"}":
+            return
+        if delimiter != b",":
+            raise _error(buf, "Expecting ',' delimiter", pos)
+        pos = skip_whitespace(buf, pos + 1)
+
+def object_members(buf, pos: int = 0) -> Iterator[tuple[str, int, int]]:
+    # yields (key, value start, value end) for each member of the object at pos
+    members = member_starts(buf, pos)
+    try:
+        key, start = next(members)
+        while True:
+            end = skip_value(buf, start)
+            yield key, start, end
+            key, start = members.send(end)
+    except StopIteration:
+        return
+
+def array_items(buf, pos: int = 0) -> Iterator[tuple[int, int]]:
+    # yields (value start, value end) for each item of the array at pos
+    pos = skip_whitespace(buf, pos)
+    if buf[pos:pos + 1] != b"[":
+        raise _error(buf, "Expecting array", pos)
+    pos = skip_whitespace(buf, pos + 1)
+    if buf[pos:pos + 1] == b"]":
+        return
+
+    while True:
+        start = pos
+        end = skip_value(buf, start)
+        yield start, end
+
+        pos = skip_whitespace(buf, end)
+        delimiter = buf[pos:pos + 1]
+        if delimiter == b"]":
+            return
+        if delimiter != b",":
+            raise _error(buf, "Expecting ',' delimiter", pos)
+        pos = skip_whitespace(buf, pos + 1)
+
+def find_start(buf, path: tuple[PathPart, ...], pos: int = 0) -> Optional[int]:
+    # locates the value at path (object keys and array indexes) without skipping over it
+    start = skip_whitespace(buf, pos)
+    for part in path:
+        opener = buf[start:start + 1]
+        found = None
+        if isinstance(part, str) and opener == b"{":
+            for key, value_start in member_starts(buf, start):
+                if key == part:
+                    found = value_start
+                    break
+        elif isinstance(part, int) and opener == b"[":
+            for index, (value_start, _) in enumerate(array_items(buf, start)):
+                if index == part:
+                    found = value_start
+                    break
+        if found is None:
+            return None
+        start = found
+    return start
+
+def find_span(buf, path: tuple[PathPart, ...], pos: int = 0) -> Optional[tuple[int, int]]:
+    # same as find_start, None if the value isn't there
+    start = find_start(buf, path, pos)
+    if start is None:
+        return None
+    return start, skip_value(buf, start)
@@ -0,0 +1,221 @@
+from array import array
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, ValuesView
+from itertools import accumulate
+import json
+from json.decoder import scanstring
+import mmap
+from pathlib import Path
+import re
+from typing import Optional
+import zlib
+from json_scan import decode_span, find_start, skip_value, skip_whitespace
+
+# translation start offset of entries whose translation is null
+_NO_TRANSLATION = 0xFFFFFFFF
+
+def _hash(key: bytes) -> int:
+    # crc32 rather than hash() so the index survives pickling into the template cache
+    return zlib.crc32(key)
+
+# the usual shape of a term with its trailing delimiter, anything else goes through the generic decoder
+_SIMPLE_TERM = re.compile(
+    rb'\{\s*"Key"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"\s*,'
+    rb'\s*"Translation"\s*:\s*(?:"([^"\\]*(?:\\.[^"\\]*)*)"|null)\s*\}'
+    rb'\s*([,\]])\s*',
+    re.DOTALL,
+)
+
+def _unescape(raw: bytes) -> str:
+    # raw is the inside of a JSON string, without its quotes
+    text = raw.decode("utf-8")
+    if "\\" in text:
+        return scanstring(text + '"', 0)[0]
+    return text
+
+def iter_terms(file: Path, keep: Optional[set[str]] = None) -> Iterator[tuple[str, Optional[str]]]:
+    # yields (Key, Translation) from the Terms array of a localization file without loading the document
+    # with keep set, translations of other keys are never decoded
+    with open(file, "rb") as f:
+        if f.seek(0, 2) == 0:
+            raise json.JSONDecodeError("Expecting value", "", 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            start = find_start(buf, ("Terms",))
+            if start is None:
+                raise json.JSONDecodeError("Expecting a Terms array", "", 0)
+            if buf[start:start + 1] != b"[":
+                raise json.JSONDecodeError("Expecting array", "", start)
+
+            pos = skip_whitespace(buf, start + 1)
+            if buf[pos:pos + 1] == b"]":
+                return
+
+            while True:
+                match = _SIMPLE_TERM.match(buf, pos)
+                if match is not None:
+                    raw_key, raw_text, delimiter = match.groups()
+                    pos = match.end()
+                    key = _unescape(raw_key)
+                    if keep is None or key in keep:
+                        yield key, None if raw_text is None else _unescape(raw_text)
+                else:
+                    end = skip_value(buf, pos)
+                    item = decode_span(buf, pos, end)
+                    if keep is None or item["Key"] in keep:
+                        yield item["Key"], item["Translation"]
+
+                    pos = skip_whitespace(buf, end)
+                    delimiter = buf[pos:pos + 1]
+                    if delimiter not in (b",", b"]"):
+                        raise json.JSONDecodeError("Expecting ',' delimiter", "", pos)
+                    pos = skip_whitespace(buf, pos + 1)
+
+                if delimiter == b"]":
+                    return
+
+class LocStore(Mapping[str, Optional[str]]):
+    """Read-only localization table packed into utf-8 buffers."""
+
+    # a dict costs two str objects and a slot per term, here keys and translations
+    # sit in two byte buffers behind offset arrays and strings are made on read
+
+    def __init__(self):
+        self._keys = b""
+        self._key_offsets = array("I", [0])
+        self._texts = b""
+        self._text_starts = array("I")
+        self._text_ends = array("I")
+        self._hashes = array("I")
+        # slot -> entry index + 1, 0 marks an empty slot
+        self._table = array("I", [0] * 8)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, Optional[str]]]) -> "LocStore":
+        # the dict only lives while building, the same as a dict the last translation of a duplicated key wins
+        positions: dict[bytes, int] = {}
+        keys: list[bytes] = []
+        texts: list[Optional[bytes]] = []
+        for key, text in pairs:
+            key_bytes = str(key).encode("utf-8")
+            text_bytes = None if text is None else str(text).encode("utf-8")
+            index = positions.setdefault(key_bytes, len(keys))
+            if index == len(keys):
+                keys.append(key_bytes)
+                texts.append(text_bytes)
+            else:
+                texts[index] = text_bytes
+        del positions
+
+        store = cls()
+        store._keys = b"".join(keys)
+        store._key_offsets.extend(accumulate(map(len, keys)))
+        store._texts = b"".join(text for text in texts if text is not None)
+        store._text_ends = array("I", accumulate(0 if text is None else len(text) for text in texts))
+        store._text_starts = array("I", [0]) + store._text_ends[:-1]
+        for index, text in enumerate(texts):
+            if text is None:
+                store._text_starts[index] = _NO_TRANSLATION
+        store._hashes = array("I", map(_hash, keys))
+
+        size = 8
+        while size < len(keys) * 2:
+            size *= 2
+        store._table = array("I", [0]) * size
+        for index in range(len(keys)):
+            store._insert(index)
+        return store
+
+    def _insert(self, index: int):
+        mask = len(self._table) - 1
+        slot = self._hashes[index] & mask
+        while self._table[slot]:
+            slot = (slot + 1) & mask
+        self._table[slot] = index + 1
+
+    def _find(self, key: bytes, key_hash: int) -> Optional[int]:
+        keys = self._keys
+        offsets = self._key_offsets
+        mask = len(self._table) - 1
+        slot = key_hash & mask
+        while True:
+            entry = self._table[slot]
+            if not entry:
+                return None
+            index = entry - 1
+            if self._hashes[index] == key_hash and keys[offsets[index]:offsets[index + 1]] == key:
+                return index
+            slot = (slot + 1) & mask
+
+    def key_at(self, index: int) -> str:
+        return self._keys[self._key_offsets[index]:self._key_offsets[index + 1]].decode("utf-8")
+
+    def value_at(self, index: int) -> Optional[str]:
+        start = self._text_starts[index]
+        if start == _NO_TRANSLATION:
+            return None
+        return self._texts[start:self._text_ends[index]].decode("utf-8")
+
+    def __getitem__(self, key: str) -> Optional[str]:
+        if not isinstance(key, str):
+            raise KeyError(key)
+        key_bytes = key.encode("utf-8")
+        index = self._find(key_bytes, _hash(key_bytes))
+        if index is None:
+            raise KeyError(key)
+        return self.value_at(index)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        key_bytes = key.encode("utf-8")
+        return self._find(key_bytes, _hash(key_bytes)) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self._hashes)):
+            yield self.key_at(index)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def items(self) -> "_LocItems":
+        return _LocItems(self)
+
+    def values(self) -> "_LocValues":
+        return _LocValues(self)
+
+    def changed_keys(self, other: "LocStore") -> set[str]:
+        # keys added, removed or translated differently in other
+        changed = {key for key in self if key not in other}
+        for key, text in other.items():
+            if key not in self or self[key] != text:
+                changed.add(key)
+        return changed
+
+    @property
+    def nbytes(self) -> int:
+        # memory held by the buffers and arrays, for comparing against a plain dict
+        return (
+            len(self._keys)
+            + len(self._texts)
+            + sum(
+                len(part) * part.itemsize
+                for part in (self._key_offsets, self._text_starts, self._text_ends, self._hashes, self._table)
+            )
+        )
+
+# walk the buffers in order instead of a hash lookup per key
+
+class _LocItems(ItemsView):
+    _mapping: LocStore
+
+    def __iter__(self):
+        store = self._mapping
+        for index in range(len(store)):
+            yield store.key_at(index), store.value_at(index)
+
+class _LocValues(ValuesView):
+    _mapping: LocStore
+
+    def __iter__(self):
+        store = self._mapping
+        for index in range(len(store)):
+            yield store.value_at(index)
@@ -0,0 +1,152 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Optional
+from PySide6.QtCore import QAbstractProxyModel, QAbstractTableModel, QModelIndex, QPersistentModelIndex, Qt
+from loc_store import LocStore
+
+# terms are joined with it, no query typed in a search box can match across two
+_SEPARATOR = "\0"
+
+class LocIndex():
+    """Substring search over the keys and translations of a LocStore, case insensitive.
+
+    The terms are folded and joined into one string with the offset of each row kept aside,
+    a search is str.find over it, jumping to the next row after each match, and a bisect to
+    turn a match into its row. A query that extends the last one only rechecks its matches.
+    """
+
+    def __init__(self, store: LocStore):
+        self.store = store
+        # built on the first search
+        self._text = ""
+        # where each row starts in _text, with the end of the text last
+        self._starts: Optional[array] = None
+        self._query = ""
+        self._rows: list[int] = []
+
+    def _build(self):
+        parts = [
+            key.casefold() if value is None else f"{key}{_SEPARATOR}{value}".casefold()
+            for key, value in self.store.items()
+        ]
+        self._starts = array("I", [0])
+        self._starts.extend(accumulate(len(part) + 1 for part in parts))
+        self._text = _SEPARATOR.join(parts)
+
+    def search(self, text: str) -> list[int]:
+        # rows whose key or translation contains text, in row order
+        query = text.casefold()
+        if not query:
+            return list(range(len(self.store)))
+        if query == self._query:
+            return self._rows
+        if self._starts is None:
+            self._build()
+        haystack, starts = self._text, self._starts
+        if self._query and self._query in query and len(self._rows) * 8 < len(self.store):
+            # few enough to check one by one, a scan would pass over every other row
+            rows = [row for row in self._rows if query in haystack[starts[row]:starts[row + 1] - 1]]
+        else:
+            rows = []
+            end = len(starts) - 1
+            position = haystack.find(query)
+            while position >= 0:
+                row = bisect_right(starts, position) - 1
+                rows.append(row)
+                if row + 1 >= end:
+                    break
+                position = haystack.find(query, starts[row + 1])
+        self._query, self._rows = query, rows
+        return rows
+
+class LocTableModel(QAbstractTableModel):
+    """Keys and translations of a LocStore, read from its buffers as rows are painted."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store: Optional[LocStore] = None
+
+    def set_store(self, store: Optional[LocStore]):
+        self.beginResetModel()
+        self.store = store
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self.store is None:
+            return 0
+        return len(self.store)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or self.store is None or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        if index.column() == 0:
+            return self.store.key_at(index.row())
+        return str(self.store.value_at(index.row()))
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return ("Key", "Value")[section]
+        return section + 1
+
+class LocFilterModel(QAbstractProxyModel):
+    """Rows of a LocTableModel matching the filter text, see LocIndex."""
+
+    def __init__(self, source: LocTableModel, parent=None):
+        super().__init__(parent)
+        self.setSourceModel(source)
+        self.search_index: Optional[LocIndex] = None
+        # source rows shown, None shows every row
+        self._rows: Optional[list[int]] = None
+        source.modelReset.connect(self._on_source_reset)
+
+    def _on_source_reset(self):
+        # a new store, its index is built again on the next filter
+        self.beginResetModel()
+        source: LocTableModel = self.sourceModel()
+        self.search_index = None if source.store is None else LocIndex(source.store)
+        self._rows = None
+        self.endResetModel()
+
+    def set_filter(self, text: str):
+        self.beginResetModel()
+        self._rows = self.search_index.search(text) if text and self.search_index is not None else None
+        self.endResetModel()
+
+    def index(self, row: int, column: int, parent=QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not 0 <= row < self.rowCount() or not 0 <= column < 2:
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.sourceModel().rowCount() if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def mapToSource(self, index: QModelIndex | QPersistentModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        row = index.row() if self._rows is None else self._rows[index.row()]
+        return self.sourceModel().index(row, index.column())
+
+    def mapFromSource(self, index: QModelIndex | QPersistentModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        if self._rows is None:
+            return self.createIndex(index.row(), index.column())
+        # the rows are in source order
+        row = bisect_left(self._rows, index.row())
+        if row == len(self._rows) or self._rows[row] != index.row():
+            return QModelIndex()
+        return self.createIndex(row, index.column())
@@ -20,9 +20,8 @@ from PySide6.QtWidgets import (QAbstractItemView, QAbstractScrollArea, QApplicat
     QComboBox, QFrame, QGridLayout, QGroupBox,
     QHBoxLayout, QHeaderView, QLabel, QMainWindow,
     QMenu, QMenuBar, QPushButton, QSizePolicy,
-    QSpinBox, QStatusBar, QTabWidget, QTableWidget,
-    QTableWidgetItem, QTreeWidget, QTreeWidgetItem, QVBoxLayout,
-    QWidget)
+    QLineEdit, QSpinBox, QStatusBar, QTabWidget, QTableView,
+    QTreeView, QVBoxLayout, QWidget)
 
 class Ui_MainWindow(object):
     def setupUi(self, MainWindow):
@@ -1930,81 +1929,113 @@ class Ui_MainWindow(object):
         self.locTab.setObjectName(u"locTab")
         self.verticalLayout_25 = QVBoxLayout(self.locTab)
         self.verticalLayout_25.setObjectName(u"verticalLayout_25")
-        self.locTableWidget = QTableWidget(self.locTab)
-        if (self.locTableWidget.columnCount() < 2):
-            self.locTableWidget.setColumnCount(2)
-        __qtablewidgetitem = QTableWidgetItem()
-        self.locTableWidget.setHorizontalHeaderItem(0, __qtablewidgetitem)
-        __qtablewidgetitem1 = QTableWidgetItem()
-        self.locTableWidget.setHorizontalHeaderItem(1, __qtablewidgetitem1)
-        if (self.locTableWidget.rowCount() < 5):
-            self.locTableWidget.setRowCount(5)
-        self.locTableWidget.setObjectName(u"locTableWidget")
-        self.locTableWidget.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
-        self.locTableWidget.setAutoFillBackground(False)
-        self.locTableWidget.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustIgnored)
-        self.locTableWidget.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.locTableWidget.setTextElideMode(Qt.TextElideMode.ElideRight)
-        self.locTableWidget.setRowCount(5)
-        self.locTableWidget.setSupportedDragActions(Qt.DropAction.IgnoreAction)
-        self.locTableWidget.verticalHeader().setVisible(True)
-
-        self.verticalLayout_25.addWidget(self.locTableWidget)
+        self.locSearchLineEdit = QLineEdit(self.locTab)
+        self.locSearchLineEdit.setObjectName(u"locSearchLineEdit")
+        self.locSearchLineEdit.setClearButtonEnabled(True)
+
+        self.verticalLayout_25.addWidget(self.locSearchLineEdit)
+
+        self.locTableView = QTableView(self.locTab)
+        self.locTableView.setObjectName(u"locTableView")
+        self.locTableView.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
+        self.locTableView.setAutoFillBackground(False)
+        self.locTableView.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustIgnored)
+        self.locTableView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.locTableView.setTextElideMode(Qt.TextElideMode.ElideRight)
+        self.locTableView.horizontalHeader().setStretchLastSection(True)
+        self.locTableView.verticalHeader().setVisible(True)
+
+        self.verticalLayout_25.addWidget(self.locTableView)
 
         self.devTabWidget.addTab(self.locTab, "")
         self.unitTemplateTab = QWidget()
         self.unitTemplateTab.setObjectName(u"unitTemplateTab")
         self.verticalLayout_26 = QVBoxLayout(self.unitTemplateTab)
         self.verticalLayout_26.setObjectName(u"verticalLayout_26")
-        self.unitTemplateTreeWidget = QTreeWidget(self.unitTemplateTab)
-        self.unitTemplateTreeWidget.setObjectName(u"unitTemplateTreeWidget")
-        self.unitTemplateTreeWidget.setSupportedDragActions(Qt.DropAction.IgnoreAction)
+        self.unitTemplateSearchLineEdit = QLineEdit(self.unitTemplateTab)
+        self.unitTemplateSearchLineEdit.setObjectName(u"unitTemplateSearchLineEdit")
+        self.unitTemplateSearchLineEdit.setClearButtonEnabled(True)
+
+        self.verticalLayout_26.addWidget(self.unitTemplateSearchLineEdit)
 
-        self.verticalLayout_26.addWidget(self.unitTemplateTreeWidget)
+        self.unitTemplateTreeView = QTreeView(self.unitTemplateTab)
+        self.unitTemplateTreeView.setObjectName(u"unitTemplateTreeView")
+        self.unitTemplateTreeView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.unitTemplateTreeView.setUniformRowHeights(True)
+
+        self.verticalLayout_26.addWidget(self.unitTemplateTreeView)
 
         self.devTabWidget.addTab(self.unitTemplateTab, "")
         self.flagTemplateTab = QWidget()
         self.flagTemplateTab.setObjectName(u"flagTemplateTab")
         self.verticalLayout_27 = QVBoxLayout(self.flagTemplateTab)
         self.verticalLayout_27.setObjectName(u"verticalLayout_27")
-        self.flagTemplateTreeWidget = QTreeWidget(self.flagTemplateTab)
-        self.flagTemplateTreeWidget.setObjectName(u"flagTemplateTreeWidget")
-        self.flagTemplateTreeWidget.setSupportedDragActions(Qt.DropAction.IgnoreAction)
+        self.flagTemplateSearchLineEdit = QLineEdit(self.flagTemplateTab)
+        self.flagTemplateSearchLineEdit.setObjectName(u"flagTemplateSearchLineEdit")
+        self.flagTemplateSearchLineEdit.setClearButtonEnabled(True)
+
+        self.verticalLayout_27.addWidget(self.flagTemplateSearchLineEdit)
+
+        self.flagTemplateTreeView = QTreeView(self.flagTemplateTab)
+        self.flagTemplateTreeView.setObjectName(u"flagTemplateTreeView")
+        self.flagTemplateTreeView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.flagTemplateTreeView.setUniformRowHeights(True)
 
-        self.verticalLayout_27.addWidget(self.flagTemplateTreeWidget)
+        self.verticalLayout_27.addWidget(self.flagTemplateTreeView)
 
         self.devTabWidget.addTab(self.flagTemplateTab, "")
         self.bustTemplateTab = QWidget()
         self.bustTemplateTab.setObjectName(u"bustTemplateTab")
         self.verticalLayout_28 = QVBoxLayout(self.bustTemplateTab)
         self.verticalLayout_28.setObjectName(u"verticalLayout_28")
-        self.bustTemplateTreeWidget = QTreeWidget(self.bustTemplateTab)
-        self.bustTemplateTreeWidget.setObjectName(u"bustTemplateTreeWidget")
-        self.bustTemplateTreeWidget.setSupportedDragActions(Qt.DropAction.IgnoreAction)
+        self.bustTemplateSearchLineEdit = QLineEdit(self.bustTemplateTab)
+        self.bustTemplateSearchLineEdit.setObjectName(u"bustTemplateSearchLineEdit")
+        self.bustTemplateSearchLineEdit.setClearButtonEnabled(True)
 
-        self.verticalLayout_28.addWidget(self.bustTemplateTreeWidget)
+        self.verticalLayout_28.addWidget(self.bustTemplateSearchLineEdit)
+
+        self.bustTemplateTreeView = QTreeView(self.bustTemplateTab)
+        self.bustTemplateTreeView.setObjectName(u"bustTemplateTreeView")
+        self.bustTemplateTreeView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.bustTemplateTreeView.setUniformRowHeights(True)
+
+        self.verticalLayout_28.addWidget(self.bustTemplateTreeView)
 
         self.devTabWidget.addTab(self.bustTemplateTab, "")
         self.upgradeTab = QWidget()
         self.upgradeTab.setObjectName(u"upgradeTab")
         self.verticalLayout_29 = QVBoxLayout(self.upgradeTab)
         self.verticalLayout_29.setObjectName(u"verticalLayout_29")
-        self.upgradeTemplateTreeWidget = QTreeWidget(self.upgradeTab)
-        self.upgradeTemplateTreeWidget.setObjectName(u"upgradeTemplateTreeWidget")
-        self.upgradeTemplateTreeWidget.setSupportedDragActions(Qt.DropAction.IgnoreAction)
+        self.upgradeTemplateSearchLineEdit = QLineEdit(self.upgradeTab)
+        self.upgradeTemplateSearchLineEdit.setObjectName(u"upgradeTemplateSearchLineEdit")
+        self.upgradeTemplateSearchLineEdit.setClearButtonEnabled(True)
+
+        self.verticalLayout_29.addWidget(self.upgradeTemplateSearchLineEdit)
 
-        self.verticalLayout_29.addWidget(self.upgradeTemplateTreeWidget)
+        self.upgradeTemplateTreeView = QTreeView(self.upgradeTab)
+        self.upgradeTemplateTreeView.setObjectName(u"upgradeTemplateTreeView")
+        self.upgradeTemplateTreeView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.upgradeTemplateTreeView.setUniformRowHeights(True)
+
+        self.verticalLayout_29.addWidget(self.upgradeTemplateTreeView)
 
         self.devTabWidget.addTab(self.upgradeTab, "")
         self.skillsTab = QWidget()
         self.skillsTab.setObjectName(u"skillsTab")
         self.verticalLayout_30 = QVBoxLayout(self.skillsTab)
         self.verticalLayout_30.setObjectName(u"verticalLayout_30")
-        self.skillsTreeWidget = QTreeWidget(self.skillsTab)
-        self.skillsTreeWidget.setObjectName(u"skillsTreeWidget")
-        self.skillsTreeWidget.setSupportedDragActions(Qt.DropAction.IgnoreAction)
+        self.skillsSearchLineEdit = QLineEdit(self.skillsTab)
+        self.skillsSearchLineEdit.setObjectName(u"skillsSearchLineEdit")
+        self.skillsSearchLineEdit.setClearButtonEnabled(True)
+
+        self.verticalLayout_30.addWidget(self.skillsSearchLineEdit)
+
+        self.skillsTreeView = QTreeView(self.skillsTab)
+        self.skillsTreeView.setObjectName(u"skillsTreeView")
+        self.skillsTreeView.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.skillsTreeView.setUniformRowHeights(True)
 
-        self.verticalLayout_30.addWidget(self.skillsTreeWidget)
+        self.verticalLayout_30.addWidget(self.skillsTreeView)
 
         self.devTabWidget.addTab(self.skillsTab, "")
 
@@ -2306,25 +2337,17 @@ class Ui_MainWindow(object):
         self.reserveCreateLeaderButton_5.setText(QCoreApplication.translate("MainWindow", u"Create Leader", None))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.leaderTab), QCoreApplication.translate("MainWindow", u"Leaders", None))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.inventoryTab), QCoreApplication.translate("MainWindow", u"Inventory", None))
-        ___qtablewidgetitem = self.locTableWidget.horizontalHeaderItem(0)
-        ___qtablewidgetitem.setText(QCoreApplication.translate("MainWindow", u"Key", None)); # type: ignore
-        ___qtablewidgetitem1 = self.locTableWidget.horizontalHeaderItem(1)
-        ___qtablewidgetitem1.setText(QCoreApplication.translate("MainWindow", u"Value", None)); # type: ignore
+        self.locSearchLineEdit.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Search keys and values", None))
         self.devTabWidget.setTabText(self.devTabWidget.indexOf(self.locTab), QCoreApplication.translate("MainWindow", u"Loc", None))
-        ___qtreewidgetitem = self.unitTemplateTreeWidget.headerItem()
-        ___qtreewidgetitem.setText(0, QCoreApplication.translate("MainWindow", u"Unit Template", None));
+        self.unitTemplateSearchLineEdit.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Search keys and values", None))
         self.devTabWidget.setTabText(self.devTabWidget.indexOf(self.unitTemplateTab), QCoreApplication.translate("MainWindow", u"UnitTemplate", None))
-        ___qtreewidgetitem1 = self.flagTemplateTreeWidget.headerItem()
-        ___qtreewidgetitem1.setText(0, QCoreApplication.translate("MainWindow", u"Flag Template", None));
+        self.flagTemplateSearchLineEdit.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Search keys and values", None))
         self.devTabWidget.setTabText(self.devTabWidget.indexOf(self.flagTemplateTab), QCoreApplication.translate("MainWindow", u"FlagTemplate", None))
-        ___qtreewidgetitem2 = self.bustTemplateTreeWidget.headerItem()
-        ___qtreewidgetitem2.setText(0, QCoreApplication.translate("MainWindow", u"Bust Template", None));
+        self.bustTemplateSearchLineEdit.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Search keys and values", None))
         self.devTabWidget.setTabText(self.devTabWidget.indexOf(self.bustTemplateTab), QCoreApplication.translate("MainWindow", u"BustTemplate", None))
-        ___qtreewidgetitem3 = self.upgradeTemplateTreeWidget.headerItem()
-        ___qtreewidgetitem3.setText(0, QCoreApplication.translate("MainWindow", u"Upgrade Template", None));
+        self.upgradeTemplateSearchLineEdit.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Search keys and values", None))
         self.devTabWidget.setTabText(self.devTabWidget.indexOf(self.upgradeTab), QCoreApplication.translate("MainWindow", u"UpgradeTemplate", None))
-        ___qtreewidgetitem4 = self.skillsTreeWidget.headerItem()
-        ___qtreewidgetitem4.setText(0, QCoreApplication.translate("MainWindow", u"Skills List", None));
+        self.skillsSearchLineEdit.setPlaceholderText(QCoreApplication.translate("MainWindow", u"Search keys and values", None))
         self.devTabWidget.setTabText(self.devTabWidget.indexOf(self.skillsTab), QCoreApplication.translate("MainWindow", u"Skills", None))
         self.tabWidget.setTabText(self.tabWidget.indexOf(self.devTab), QCoreApplication.translate("MainWindow", u"Dev", None))
         self.menuFile.setTitle(QCoreApplication.translate("MainWindow", u"File", None))
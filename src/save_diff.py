@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import blake2b
+import json
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+from save_intern import writable
+from save_splice import RawJson
+
+# Edits happen in place on the loaded document, so the state it was loaded in is kept as a tree
+# of subtree hashes. A diff hashes the edited document the same way and only walks into subtrees
+# whose hashes differ, everything else is skipped with one comparison.
+# Equal digests are taken as equal values, so they're blake2b rather than hash(), which collides
+# on purpose for some values, hash(-1) == hash(-2).
+
+DIGEST_SIZE = 16
+
+PathKey = Union[str, int]
+
+class _Missing():
+    def __repr__(self) -> str:
+        return "<missing>"
+
+# old value of an added member, new value of a removed one
+MISSING = _Missing()
+
+@dataclass
+class HashNode():
+    digest: bytes
+    # scalars and RawJson, None for containers
+    value: Any = None
+    # member key or index -> node, a dict for objects and a list for arrays
+    children: Union[dict[str, "HashNode"], list["HashNode"], None] = None
+
+    def materialize(self) -> Any:
+        # the value as it was when hashed
+        if isinstance(self.children, dict):
+            return {key: child.materialize() for key, child in self.children.items()}
+        if isinstance(self.children, list):
+            return [child.materialize() for child in self.children]
+        return self.value
+
+def _dict_node(children: dict[str, HashNode]) -> HashNode:
+    # keys are repr'd, which never contains a NUL, digests all have the same size
+    keys = "\0".join(map(repr, children)).encode("utf-8", "surrogatepass")
+    digests = b"".join(child.digest for child in children.values())
+    payload = b"d%d\0%s\0%s" % (len(children), keys, digests)
+    return HashNode(blake2b(payload, digest_size=DIGEST_SIZE).digest(), children=children)
+
+def _list_node(items: list[HashNode]) -> HashNode:
+    payload = b"l" + b"".join(child.digest for child in items)
+    return HashNode(blake2b(payload, digest_size=DIGEST_SIZE).digest(), children=items)
+
+def hash_tree(value: Any) -> HashNode:
+    # the type is part of the hash, 1, 1.0 and True are different values in a save
+    # RawJson is the same value as long as it's the same span of the same file, it's never decoded
+    if isinstance(value, dict):
+        return _dict_node({key: hash_tree(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return _list_node([hash_tree(item) for item in value])
+    if isinstance(value, RawJson):
+        payload = f"RawJson\0{id(value.source)}\0{value.start}\0{value.end}"
+    else:
+        # repr of a JSON scalar tells every value of its type apart, floats included
+        payload = f"{type(value).__name__}\0{value!r}"
+    return HashNode(blake2b(payload.encode("utf-8", "surrogatepass"), digest_size=DIGEST_SIZE).digest(), value)
+
+class Change(NamedTuple):
+    path: tuple[PathKey, ...]
+    old: Any
+    new: Any
+
+    @property
+    def kind(self) -> str:
+        if self.old is MISSING:
+            return "added"
+        if self.new is MISSING:
+            return "removed"
+        return "changed"
+
+    @property
+    def path_text(self) -> str:
+        return "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in self.path).lstrip(".")
+
+def _diff_nodes(old: HashNode, new: HashNode, path: tuple[PathKey, ...], changes: list[Change]):
+    if old.digest == new.digest:
+        return
+    if isinstance(old.children, dict) and isinstance(new.children, dict):
+        for key, old_child in old.children.items():
+            new_child = new.children.get(key)
+            if new_child is None:
+                changes.append(Change(path + (key,), old_child.materialize(), MISSING))
+            else:
+                _diff_nodes(old_child, new_child, path + (key,), changes)
+        for key, new_child in new.children.items():
+            if key not in old.children:
+                changes.append(Change(path + (key,), MISSING, new_child.materialize()))
+        return
+    if isinstance(old.children, list) and isinstance(new.children, list):
+        # arrays in a save are slots, items are compared by position
+        for index, (old_child, new_child) in enumerate(zip(old.children, new.children)):
+            _diff_nodes(old_child, new_child, path + (index,), changes)
+        for index in range(len(new.children), len(old.children)):
+            changes.append(Change(path + (index,), old.children[index].materialize(), MISSING))
+        for index in range(len(old.children), len(new.children)):
+            changes.append(Change(path + (index,), MISSING, new.children[index].materialize()))
+        return
+    changes.append(Change(path, old.materialize(), new.materialize()))
+
+def diff_trees(old: HashNode, new: HashNode) -> list[Change]:
+    changes: list[Change] = []
+    _diff_nodes(old, new, (), changes)
+    return changes
+
+def diff_save(snapshot: HashNode, data: Any) -> list[Change]:
+    # snapshot is hash_tree of the document when it was loaded, data the same document now
+    return diff_trees(snapshot, hash_tree(data))
+
+def rehash_paths(tree: HashNode, data: Any, paths: list[tuple[PathKey, ...]]) -> HashNode:
+    # hash_tree of data when only the values at paths differ from what tree was hashed from
+    # every subtree off those paths is reused as it is
+    if any(not path for path in paths) or tree.children is None:
+        return hash_tree(data)
+    branches: dict[PathKey, list[tuple[PathKey, ...]]] = {}
+    for path in paths:
+        branches.setdefault(path[0], []).append(path[1:])
+
+    if isinstance(tree.children, dict) and isinstance(data, dict):
+        children = {}
+        for key, item in data.items():
+            child = tree.children.get(key)
+            if child is None:
+                children[key] = hash_tree(item)
+            elif key in branches:
+                children[key] = rehash_paths(child, item, branches[key])
+            else:
+                children[key] = child
+        return _dict_node(children)
+    if isinstance(tree.children, list) and isinstance(data, list):
+        items = []
+        for index, item in enumerate(data):
+            if index >= len(tree.children):
+                items.append(hash_tree(item))
+            elif index in branches:
+                items.append(rehash_paths(tree.children[index], item, branches[index]))
+            else:
+                items.append(tree.children[index])
+        return _list_node(items)
+    return hash_tree(data)
+
+def _copy(value: Any) -> Any:
+    # containers put in the document are edited in place later, changes keep their own
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+def apply_changes(data: Any, changes: list[Change], revert: bool = False):
+    # sets every path to its new value, or its old one when reverting, in place
+    # values are set first, in order so array items are appended in sequence,
+    # then members are removed, last first so array items are popped from the end
+    targets = [(change.path, change.old if revert else change.new) for change in changes]
+    for path, value in targets:
+        if value is not MISSING:
+            parent = writable(data, path[:-1])
+            if isinstance(parent, list) and path[-1] == len(parent):
+                parent.append(_copy(value))
+            else:
+                parent[path[-1]] = _copy(value)
+    for path, value in reversed(targets):
+        if value is MISSING:
+            parent = writable(data, path[:-1])
+            if isinstance(parent, list):
+                parent.pop(path[-1])
+            else:
+                del parent[path[-1]]
+
+def format_value(value: Any, limit: int = 80) -> str:
+    if value is MISSING or isinstance(value, RawJson):
+        return repr(value)
+    text = json.dumps(value, ensure_ascii=False, default=repr)
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+def format_changes(changes: list[Change], limit: int = 80) -> str:
+    lines = []
+    for change in changes:
+        if change.kind == "added":
+            lines.append(f"+ {change.path_text}: {format_value(change.new, limit)}")
+        elif change.kind == "removed":
+            lines.append(f"- {change.path_text}: {format_value(change.old, limit)}")
+        else:
+            lines.append(f"~ {change.path_text}: {format_value(change.old, limit)} -> {format_value(change.new, limit)}")
+    return "\n".join(lines)
+
+def append_change_log(log_path: Path, save_path: Path, changes: list[Change], when: Optional[datetime] = None):
+    # one block per save, values written in full
+    when = datetime.now() if when is None else when
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(f"[{when:%Y-%m-%d %H:%M:%S}] {save_path} ({len(changes)} changes)\n")
+        if changes:
+            f.write(format_changes(changes, limit=1 << 16) + "\n")
+        f.write("\n")
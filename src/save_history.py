@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Any, Iterable, Optional
+from save_diff import Change, HashNode, PathKey, apply_changes, diff_trees, hash_tree, rehash_paths
+
+# steps kept for undo, the oldest are dropped past this
+HISTORY_LIMIT = 500
+
+class SaveHistory():
+    """Undo and redo over the save document, kept as the changes of each step.
+
+    A step holds only the values it changed, so history costs what was edited, not copies of the
+    save, and undoing one patches those paths back and hashes only them again. Everything off the
+    edited paths is RawJson and is never copied or walked.
+    """
+
+    def __init__(self, limit: int = HISTORY_LIMIT):
+        self.undo_steps: deque[list[Change]] = deque(maxlen=limit)
+        self.redo_steps: list[list[Change]] = []
+        # the document at the last checkpoint, the next step is diffed against it
+        self.snapshot: Optional[HashNode] = None
+
+    def reset(self, data: Any):
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self.snapshot = None if data is None else hash_tree(data)
+
+    def checkpoint(self, data: Any, paths: Optional[Iterable[tuple[PathKey, ...]]] = None) -> list[Change]:
+        # records what changed since the last checkpoint as one step, nothing if nothing did
+        # paths are the only ones edited since, just they are hashed again, None hashes everything
+        if self.snapshot is None:
+            return []
+        if paths is None:
+            tree = hash_tree(data)
+        else:
+            paths = list(paths)
+            if not paths:
+                return []
+            tree = rehash_paths(self.snapshot, data, paths)
+        changes = diff_trees(self.snapshot, tree)
+        self.snapshot = tree
+        if changes:
+            self.undo_steps.append(changes)
+            self.redo_steps.clear()
+        return changes
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_steps)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_steps)
+
+    def undo(self, data: Any) -> list[Change]:
+        # reverts the last step in place, checkpoint first so edits since then aren't lost
+        if not self.undo_steps:
+            return []
+        changes = self.undo_steps.pop()
+        apply_changes(data, changes, revert=True)
+        self.redo_steps.append(changes)
+        self._rehash(data, changes)
+        return changes
+
+    def redo(self, data: Any) -> list[Change]:
+        if not self.redo_steps:
+            return []
+        changes = self.redo_steps.pop()
+        apply_changes(data, changes)
+        self.undo_steps.append(changes)
+        self._rehash(data, changes)
+        return changes
+
+    def _rehash(self, data: Any, changes: list[Change]):
+        # only the patched paths are hashed again, undo costs what the step changed
+        if self.snapshot is not None:
+            self.snapshot = rehash_paths(self.snapshot, data, [change.path for change in changes])
@@ -0,0 +1,123 @@
+import sys
+from threading import Lock
+from typing import Any, Union
+from weakref import WeakValueDictionary
+
+# Regiments repeat the same inventories, empty item slots, locked slot arrays and color dicts
+# over and over. Interning keeps one copy of each distinct structure, shared by every regiment
+# and every open save that has it, and one copy of each repeated string.
+# Shared containers are frozen: a path is made writable first, which copies the shared
+# containers along it, see writable.
+
+class SharedDict(dict):
+    """A dict that may be referenced from several places in one or more saves."""
+
+    __slots__ = ("__weakref__",)
+
+    def _frozen(self, *args, **kwargs):
+        raise TypeError("shared dict, get it through writable() before changing it")
+
+    __setitem__ = __delitem__ = update = pop = popitem = clear = setdefault = __ior__ = _frozen
+
+class SharedList(list):
+    """A list that may be referenced from several places in one or more saves."""
+
+    __slots__ = ("__weakref__",)
+
+    def _frozen(self, *args, **kwargs):
+        raise TypeError("shared list, get it through writable() before changing it")
+
+    __setitem__ = __delitem__ = append = extend = insert = pop = remove = clear = sort = reverse = _frozen
+    __iadd__ = __imul__ = _frozen
+
+SHARED_TYPES = (SharedDict, SharedList)
+
+# structure hash -> its one shared copy, entries go away with the last save using them
+# only the hash is kept as the key, a hit is checked against the structure before it's shared
+_pool: "WeakValueDictionary[int, Union[SharedDict, SharedList]]" = WeakValueDictionary()
+_pool_lock = Lock()
+
+def intern_value(value: Any) -> Any:
+    # value with every container replaced by its shared copy and every string interned
+    # RawJson and other values are returned as they are
+    with _pool_lock:
+        return _intern(value)
+
+def _intern(value: Any) -> Any:
+    kind = type(value)
+    if kind is str:
+        return _strings(value)
+    if kind is not dict and kind is not list and kind is not SharedDict and kind is not SharedList:
+        return value
+
+    # children first, a shared child is then known by its identity
+    # scalars are checked inline, most of a save is scalars and a call per value adds up
+    values = value.values() if kind is dict or kind is SharedDict else value
+    items = []
+    parts = []
+    for item in values:
+        item_kind = type(item)
+        if item_kind is str:
+            item = _strings(item)
+            parts.append(item)
+        elif item_kind is dict or item_kind is list or item_kind is SharedDict or item_kind is SharedList:
+            item = _intern(item)
+            parts.append(id(item))
+        elif item_kind is bool or item_kind is float:
+            # 1, 1.0 and True are equal and hash the same, the type keeps them apart
+            parts.append((item_kind, item))
+        else:
+            parts.append(item)
+        items.append(item)
+
+    if kind is dict or kind is SharedDict:
+        keys = tuple(map(_strings, value))
+        digest = hash((keys, tuple(parts)))
+        shared = _pool.get(digest)
+        if type(shared) is SharedDict and tuple(shared) == keys and all(map(_same, shared.values(), items)):
+            return shared
+        shared = SharedDict(zip(keys, items))
+    else:
+        digest = hash((list, tuple(parts)))
+        shared = _pool.get(digest)
+        if type(shared) is SharedList and len(shared) == len(items) and all(map(_same, shared, items)):
+            return shared
+        shared = SharedList(items)
+    # a collision keeps the first structure in the pool, this one just isn't shared
+    _pool.setdefault(digest, shared)
+    return shared
+
+_strings = sys.intern
+
+def _same(a: Any, b: Any) -> bool:
+    # shared containers are the same only if they're the same object
+    return a is b or (type(a) is type(b) and type(a) not in SHARED_TYPES and a == b)
+
+def intern_document(data: Any, depth: int = 1) -> Any:
+    # shares what's below depth, the root stays private so writable can always start from it
+    if depth and isinstance(data, dict):
+        return {key: intern_document(item, depth - 1) for key, item in data.items()}
+    if depth and isinstance(data, list):
+        return [intern_document(item, depth - 1) for item in data]
+    return intern_value(data)
+
+def thaw(value: Any) -> Any:
+    # a private shallow copy of a shared container, anything else as it is
+    if isinstance(value, SharedDict):
+        return dict(value)
+    if isinstance(value, SharedList):
+        return list(value)
+    return value
+
+def writable(data: Any, path: tuple) -> Any:
+    # the container at path, after every shared container from the root down to it was
+    # replaced by a private copy, siblings along the way stay shared
+    # the root itself is never shared, see intern_document
+    node = data
+    for part in path:
+        child = node[part]
+        if isinstance(child, SHARED_TYPES):
+            child = thaw(child)
+            node[part] = child
+        node = child
+    return node
@@ -0,0 +1,33 @@
+from pathlib import Path
+from PySide6.QtCore import QThread, Signal
+from save_diff import hash_tree
+from save_splice import load_save
+from save_view import build_save_view
+
+class SaveLoader(QThread):
+    """Reads a save and works out every widget value off the GUI thread."""
+
+    # short description of what's being done
+    phaseStarted = Signal(str)
+    # data, its SpliceSource, the SaveView to apply and the hash_tree edits are diffed against
+    saveLoaded = Signal(object, object, object, object)
+    # path, error message
+    loadFailed = Signal(str, str)
+
+    def __init__(self, path: Path, intern: bool = False, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self.intern = intern
+
+    def run(self):
+        try:
+            self.phaseStarted.emit(f"Reading {self.path.name}...")
+            data, source = load_save(self.path, self.intern)
+            self.phaseStarted.emit(f"Preparing {self.path.name}...")
+            view = build_save_view(data)
+            snapshot = hash_tree(data)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # ValueError covers invalid JSON, KeyError and TypeError a file that isn't a save
+            self.loadFailed.emit(str(self.path), f"{type(e).__name__}: {e}")
+            return
+        self.saveLoaded.emit(data, source, view, snapshot)
@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+from PySide6.QtCore import QObject, Signal
+from save_diff import MISSING, PathKey
+from save_intern import writable
+
+DocPath = tuple[PathKey, ...]
+
+# paths of the parts of a save the editor shows
+PLAYER: DocPath = ("PlayerSaveData",)
+ARMY: DocPath = PLAYER + ("ArmySaveData",)
+DIVISIONS: DocPath = ARMY + ("Divisions",)
+RESERVE_REGIMENTS: DocPath = ARMY + ("ReserveRegiments",)
+RESERVE_OFFICERS: DocPath = ARMY + ("ReserveOfficers",)
+
+@dataclass(eq=False)
+class Binding():
+    path: DocPath
+    # called with the value at path, None when it or a parent doesn't exist
+    update: Callable[[Any], None]
+    # also updated when something below path changes, for widgets showing a whole subtree
+    deep: bool = False
+
+class SaveModel(QObject):
+    """The open save, changed through paths so only the widgets bound to a changed path update."""
+
+    # paths that changed, () is the whole document
+    pathsChanged = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data: Any = None
+        # path -> bindings on exactly that path
+        self._bindings: dict[DocPath, list[Binding]] = {}
+        # path -> bindings on that path or anything below it
+        self._under: dict[DocPath, list[Binding]] = {}
+
+    def bind(self, path: DocPath, update: Callable[[Any], None], deep: bool = False) -> Binding:
+        binding = Binding(tuple(path), update, deep)
+        self._bindings.setdefault(binding.path, []).append(binding)
+        for end in range(len(binding.path) + 1):
+            self._under.setdefault(binding.path[:end], []).append(binding)
+        return binding
+
+    def get(self, path: DocPath, default: Any = None) -> Any:
+        value = self.data
+        for part in path:
+            try:
+                value = value[part]
+            except (KeyError, IndexError, TypeError):
+                return default
+            if value is None:
+                return default
+        return value
+
+    def set(self, path: DocPath, value: Any) -> bool:
+        # False when the parent doesn't exist, an empty slot has nothing to set a level on
+        if not isinstance(self.get(path[:-1]), (dict, list)):
+            return False
+        parent = self.writable(path[:-1])
+        key = path[-1]
+        if isinstance(parent, list) and key == len(parent):
+            parent.append(value)
+        elif isinstance(parent, list) and not 0 <= key < len(parent):
+            return False
+        else:
+            old = parent.get(key, MISSING) if isinstance(parent, dict) else parent[key]
+            # containers may have been edited in place, they always count as changed
+            if not isinstance(value, (dict, list)) and type(old) is type(value) and old == value:
+                return True
+            parent[key] = value
+        self.changed([path])
+        return True
+
+    def writable(self, path: DocPath) -> Any:
+        # the container at path, safe to change in place, see save_intern
+        return writable(self.data, path)
+
+    def reset(self, data: Any, notify: bool = True):
+        self.data = data
+        if notify:
+            self.changed([()])
+
+    def changed(self, paths: Iterable[DocPath]):
+        # for values changed without set, like an undo patching the document
+        paths = [tuple(path) for path in paths]
+        affected: dict[int, Binding] = {}
+        for path in paths:
+            for binding in self._under.get(path, ()):
+                affected.setdefault(id(binding), binding)
+            for end in range(len(path)):
+                for binding in self._bindings.get(path[:end], ()):
+                    if binding.deep:
+                        affected.setdefault(id(binding), binding)
+        for binding in affected.values():
+            binding.update(self.get(binding.path))
+        if paths:
+            self.pathsChanged.emit(paths)
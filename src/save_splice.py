@@ -0,0 +1,242 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+from json_backend import loads
+from json_scan import array_items, member_starts, skip_indented, skip_value, skip_whitespace
+from save_intern import intern_document
+from save_writer import SaveFormat, detect_format, encode_save
+
+# values the editor reads and writes, "*" is every item of an array or every member of an object
+# containers along these paths get a span per member, anything off them is one opaque span
+# that is never decoded, see RawJson
+# regiments and officers are edited a member at a time, so only the members that changed are
+# written back, see _MEMBERS
+EDITED_PATHS = (
+    ("PlayerSaveData", "Cash"),
+    ("PlayerSaveData", "Food"),
+    ("PlayerSaveData", "Ammo"),
+    ("PlayerSaveData", "Manpower"),
+    ("PlayerSaveData", "ArmySaveData", "Divisions", "*", "Regiments", "*", "*"),
+    ("PlayerSaveData", "ArmySaveData", "Divisions", "*", "OfficerSave", "*"),
+    ("PlayerSaveData", "ArmySaveData", "ReserveRegiments", "*", "*"),
+    ("PlayerSaveData", "ArmySaveData", "ReserveOfficers", "*", "*"),
+)
+
+PathTrie = dict[str, "PathTrie"]
+
+def _path_trie(paths) -> PathTrie:
+    trie: PathTrie = {}
+    for path in paths:
+        node = trie
+        for part in path:
+            node = node.setdefault(part, {})
+    return trie
+
+_EDITED_TRIE = _path_trie(EDITED_PATHS)
+
+# an object whose members are each edited as a whole, like a regiment
+# it's decoded and spanned as one value on load, its members are only spanned when it's
+# written with changes, so loading costs nothing for the hundreds that never are
+_MEMBERS: PathTrie = {"*": {}}
+
+@dataclass
+class SpanNode():
+    start: int
+    end: int
+    # member key or index -> span, in document order, None when the value is a single span
+    children: Optional[dict[Union[str, int], "SpanNode"]] = None
+    # off the edited paths, kept as bytes instead of being decoded
+    raw: bool = False
+    # trie of a value whose members are spanned when it's written, see _MEMBERS
+    members: Optional[PathTrie] = None
+
+class RawJson():
+    """A value of the opened save left as its bytes, written back as they are."""
+
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source: "SpliceSource", start: int, end: int):
+        self.source = source
+        self.start = start
+        self.end = end
+
+    def decode(self) -> Any:
+        return loads(self.source.raw[self.start:self.end])
+
+    def __repr__(self) -> str:
+        return f"RawJson({self.end - self.start} bytes)"
+
+def _skip_member(buf, start: int, margin: Optional[bytes]) -> int:
+    if margin is not None and buf[start:start + 1] in (b"{", b"["):
+        end = skip_indented(buf, start, margin)
+        if end is not None:
+            return end
+    return skip_value(buf, start)
+
+def index_spans(
+    buf,
+    trie: PathTrie = _EDITED_TRIE,
+    pos: int = 0,
+    depth: int = 0,
+    fmt: Optional[SaveFormat] = None,
+    lazy: bool = True,
+) -> SpanNode:
+    # fmt is the layout of buf, pretty printed members are skipped by their indentation
+    # lazy leaves objects under _MEMBERS as one span, index them again with lazy off for their members
+    start = skip_whitespace(buf, pos)
+    opener = buf[start:start + 1]
+    if not trie or opener not in (b"{", b"["):
+        return SpanNode(start, skip_value(buf, start))
+    if lazy and trie == _MEMBERS and opener == b"{":
+        return SpanNode(start, skip_value(buf, start), members=trie)
+
+    margin = None
+    if fmt is not None and fmt.indent is not None:
+        unit = " " * fmt.indent if isinstance(fmt.indent, int) else fmt.indent
+        margin = (fmt.newline + unit * (depth + 1)).encode("ascii")
+
+    children: dict[Union[str, int], SpanNode] = {}
+    end = start
+    if opener == b"{":
+        members = member_starts(buf, start)
+        try:
+            key, value_start = next(members)
+            while True:
+                if key in trie or "*" in trie:
+                    child = index_spans(buf, trie.get(key, trie.get("*", {})), value_start, depth + 1, fmt)
+                else:
+                    child = SpanNode(value_start, _skip_member(buf, value_start, margin), raw=True)
+                children[key] = child
+                end = child.end
+                key, value_start = members.send(end)
+        except StopIteration:
+            pass
+    else:
+        item_trie = trie.get("*", {})
+        # items array_items already skipped are left as they are, unless something in them is edited
+        spanned = item_trie and not (lazy and item_trie == _MEMBERS)
+        for index, (value_start, value_end) in enumerate(array_items(buf, start)):
+            if spanned:
+                children[index] = index_spans(buf, item_trie, value_start, depth + 1, fmt)
+            elif item_trie and buf[value_start:value_start + 1] == b"{":
+                children[index] = SpanNode(value_start, value_end, members=item_trie)
+            else:
+                children[index] = SpanNode(value_start, value_end)
+            end = value_end
+
+    # the closing bracket, past the last member
+    end = skip_whitespace(buf, end)
+    if children:
+        end += 1
+    else:
+        end = skip_value(buf, start)
+    return SpanNode(start, end, children)
+
+class SpliceSource():
+    """Bytes of the opened save and the spans of the values the editor may change."""
+
+    def __init__(self, raw: bytes, fmt: Optional[SaveFormat] = None):
+        self.raw = raw
+        self.format = detect_format(raw[:4096]) if fmt is None else fmt
+        self.root = index_spans(raw, fmt=self.format)
+
+    def decode(self) -> Any:
+        # the document with everything off the edited paths left as RawJson
+        return self._build(self.root)
+
+    def _build(self, node: SpanNode) -> Any:
+        if node.raw:
+            return RawJson(self, node.start, node.end)
+        if node.children is None:
+            return loads(self.raw[node.start:node.end])
+        if self.raw[node.start:node.start + 1] == b"{":
+            return {key: self._build(child) for key, child in node.children.items()}
+        return [self._build(child) for child in node.children.values()]
+
+    def render(self, data: Any, fmt: Optional[SaveFormat] = None) -> bytes:
+        # in the layout of the opened file unchanged values are copied from its bytes and the rest
+        # is encoded in place, any other layout means encoding everything
+        if fmt is not None and fmt != self.format:
+            return encode_save(resolve_raw(data), fmt)
+
+        replacements: list[tuple[int, int, bytes]] = []
+        self._collect(self.root, data, 0, replacements)
+
+        pieces: list[bytes] = []
+        pos = 0
+        for start, end, encoded in replacements:
+            pieces.append(self.raw[pos:start])
+            pieces.append(encoded)
+            pos = end
+        pieces.append(self.raw[pos:])
+        return b"".join(pieces)
+
+    def _collect(self, node: SpanNode, value: Any, depth: int, replacements: list[tuple[int, int, bytes]]):
+        children = node.children
+        if children is not None:
+            # same keys in the same order (or same length), the brackets and separators stay as they were
+            if isinstance(value, dict) and list(value) == list(children):
+                for key, child in children.items():
+                    self._collect(child, value[key], depth + 1, replacements)
+                return
+            if isinstance(value, list) and len(value) == len(children):
+                for index, child in children.items():
+                    self._collect(child, value[index], depth + 1, replacements)
+                return
+        elif isinstance(value, RawJson):
+            if value.source is self and value.start == node.start and value.end == node.end:
+                return
+        else:
+            original = loads(self.raw[node.start:node.end])
+            if _same_json(original, value):
+                return
+            if node.members is not None and isinstance(original, dict) and isinstance(value, dict) and list(original) == list(value):
+                # same members, only the ones that changed are written and the rest keep their bytes
+                self._collect(index_spans(self.raw, node.members, node.start, depth, self.format, lazy=False), value, depth, replacements)
+                return
+
+        replacements.append((node.start, node.end, encode_save(resolve_raw(value), self.format, depth)))
+
+def _same_json(original: Any, value: Any) -> bool:
+    # whether value encodes to what original was decoded from
+    # interned containers are dict and list subclasses, equal to the plain ones they came from
+    # 1 == 1.0 == True, a changed type has to be written out too, and so does a changed key order
+    if isinstance(original, dict):
+        if not isinstance(value, dict) or list(original) != list(value):
+            return False
+        pairs = zip(original.values(), value.values())
+    elif isinstance(original, list):
+        if not isinstance(value, list) or len(original) != len(value):
+            return False
+        pairs = zip(original, value)
+    else:
+        return type(original) is type(value) and original == value
+    # scalars are checked inline, a call per value adds up over a whole regiment
+    for item, other in pairs:
+        kind = type(item)
+        if kind is dict or kind is list:
+            if not _same_json(item, other):
+                return False
+        elif kind is not type(other) or item != other:
+            return False
+    return True
+
+def resolve_raw(value: Any) -> Any:
+    # a copy with every RawJson decoded, for encoders that need plain values
+    if isinstance(value, RawJson):
+        return value.decode()
+    if isinstance(value, dict):
+        return {key: resolve_raw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_raw(item) for item in value]
+    return value
+
+def load_save(path: Path, intern: bool = False) -> tuple[Any, SpliceSource]:
+    # the file is read once and kept as bytes, only the edited paths become python objects
+    # a memory map would hold the file open and on Windows block replacing it when saving over it
+    # intern shares repeated structures between regiments and open saves, see save_intern
+    with open(path, "rb") as f:
+        raw = f.read()
+    source = SpliceSource(raw)
+    data = source.decode()
+    return (intern_document(data) if intern else data), source
@@ -0,0 +1,65 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from army import Army, Officer, Regiment
+
+# the values load_data puts in the widgets, worked out ahead so applying them needs no lookups
+# units and skills are kept as ids, combos find their row by id, see TemplateItemModel.row
+
+@dataclass
+class RegimentView():
+    unit_id: str
+    level: int
+
+@dataclass
+class OfficerView():
+    label: str
+    level: int
+    skill_points: int
+    skill_ids: list[str] = field(default_factory=list)
+
+@dataclass
+class SaveView():
+    cash: int
+    food: int
+    ammo: int
+    manpower: int
+    # None where the slot is empty
+    reserve_regiments: list[Optional[RegimentView]] = field(default_factory=list)
+    # regiments of each division, by position
+    divisions: list[list[Optional[RegimentView]]] = field(default_factory=list)
+    officers: list[Optional[OfficerView]] = field(default_factory=list)
+    reserve_officers: list[Optional[OfficerView]] = field(default_factory=list)
+
+def _regiment_view(regiment: Optional[Regiment]) -> Optional[RegimentView]:
+    if regiment is None:
+        return None
+    return RegimentView(regiment.unit_id, regiment.level)
+
+def _officer_view(officer: Optional[Officer]) -> Optional[OfficerView]:
+    if officer is None:
+        return None
+    return OfficerView(
+        officer.full_name,
+        officer.level,
+        officer.skill_points,
+        list(officer.skills),
+    )
+
+def build_save_view(data: dict[str, Any]) -> SaveView:
+    player_data = data["PlayerSaveData"]
+    army = Army.of(data)
+    divisions = army.divisions
+
+    return SaveView(
+        cash=player_data["Cash"],
+        food=player_data["Food"],
+        ammo=player_data["Ammo"],
+        manpower=player_data["Manpower"],
+        reserve_regiments=[_regiment_view(item) for item in army.reserve_regiments],
+        divisions=[
+            [_regiment_view(regiment) for regiment in division.regiments[:4]]
+            for division in divisions
+        ],
+        officers=[_officer_view(division.officer) for division in divisions],
+        reserve_officers=[_officer_view(item) for item in army.reserve_officers],
+    )
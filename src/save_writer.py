@@ -0,0 +1,130 @@
+from contextlib import suppress
+import os
+from pathlib import Path
+import re
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
+from PySide6.QtCore import QThread, Signal
+from json_backend import dumps
+
+if TYPE_CHECKING:
+    from backup_store import BackupStore
+    from save_splice import SpliceSource
+
+# pretty is what the editor always wrote, compact drops all whitespace, original is the layout
+# of the file that was opened, in that layout only the edited values are rewritten (see save_splice)
+SAVE_MODES = ("pretty", "compact", "original")
+DEFAULT_SAVE_MODE = "original"
+# the encoded save goes to disk in a few large writes instead of one per token
+WRITE_BUFFER_SIZE = 1 << 20
+
+_INDENT = re.compile(rb"[\[{][ \t]*\r?\n([ \t]+)\S")
+
+class SaveFormat(NamedTuple):
+    # None is compact, same meaning as the indent of json.dumps
+    indent: Union[int, str, None]
+    newline: str
+
+PRETTY = SaveFormat(2, os.linesep)
+COMPACT = SaveFormat(None, "")
+
+def detect_format(head: bytes) -> SaveFormat:
+    # head is the start of a save file, a few KB is plenty
+    match = _INDENT.search(head)
+    if match is None:
+        return COMPACT
+    indent = match.group(1).decode("ascii")
+    newline = "\r\n" if b"\r\n" in head[:match.end()] else "\n"
+    return SaveFormat(len(indent) if indent.strip(" ") == "" else indent, newline)
+
+def save_format(mode: str, original: Optional[SaveFormat] = None) -> SaveFormat:
+    if mode == "compact":
+        return COMPACT
+    if mode == "original" and original is not None:
+        return original
+    return PRETTY
+
+def encode_save(data: Any, fmt: SaveFormat, depth: int = 0) -> bytes:
+    # depth indents every line after the first, for a value nested that deep in a document
+    text = dumps(data, fmt.indent)
+    # strings are escaped, every raw newline in the output is layout
+    if fmt.indent is not None:
+        if depth:
+            unit = " " * fmt.indent if isinstance(fmt.indent, int) else fmt.indent
+            text = text.replace("\n", "\n" + unit * depth)
+        if fmt.newline != "\n":
+            text = text.replace("\n", fmt.newline)
+    return text.encode("utf-8")
+
+def write_save(
+    data: Any,
+    path: Path,
+    fmt: SaveFormat = PRETTY,
+    source: Optional["SpliceSource"] = None,
+    backups: Optional["BackupStore"] = None,
+) -> int:
+    # written next to the target and swapped in, returns the bytes written
+    # data from a source can hold raw values, the source encodes it and splices when the layout allows
+    payload = encode_save(data, fmt) if source is None else source.render(data, fmt)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or None)
+    try:
+        with open(fd, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # the file being overwritten is kept first, if that fails nothing is overwritten
+        if backups is not None:
+            try:
+                backups.backup(path)
+            except OSError as e:
+                raise BackupError(str(e)) from e
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_path)
+        raise
+    return len(payload)
+
+class BackupError(OSError):
+    """Raised when the file a save would overwrite couldn't be backed up."""
+    pass
+
+class SaveWriter(QThread):
+    """Encodes and writes a save off the GUI thread, data must not change until it's done."""
+
+    # path, bytes written, seconds taken
+    saveWritten = Signal(str, int, float)
+    # path, error message
+    saveFailed = Signal(str, str)
+    # path, error message, nothing was written
+    backupFailed = Signal(str, str)
+
+    def __init__(
+        self,
+        data: Any,
+        path: Path,
+        fmt: SaveFormat = PRETTY,
+        source: Optional["SpliceSource"] = None,
+        backups: Optional["BackupStore"] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.data = data
+        self.path = Path(path)
+        self.fmt = fmt
+        self.source = source
+        self.backups = backups
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            written = write_save(self.data, self.path, self.fmt, self.source, self.backups)
+        except BackupError as e:
+            self.backupFailed.emit(str(self.path), str(e))
+            return
+        except (OSError, TypeError, ValueError) as e:
+            self.saveFailed.emit(str(self.path), str(e))
+            return
+        self.saveWritten.emit(str(self.path), written, time.perf_counter() - start)
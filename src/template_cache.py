@@ -0,0 +1,76 @@
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+from typing import Any, Callable, NamedTuple, Optional
+from constants import TEMPLATE_CACHE
+
+# bump when the cached TemplateStore layout changes
+CACHE_VERSION = 3
+
+class Fingerprint(NamedTuple):
+    size: int
+    mtime_ns: int
+    digest: str
+
+def fingerprint(file: Path, previous: Optional[Fingerprint] = None) -> Fingerprint:
+    stat = file.stat()
+    # same size and mtime, trust the old hash instead of reading the file again
+    if previous is not None and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+        return previous
+
+    with file.open("rb") as f:
+        digest = hashlib.file_digest(f, "blake2b").hexdigest()
+    return Fingerprint(stat.st_size, stat.st_mtime_ns, digest)
+
+class TemplateCache():
+    """Pickled TemplateStore kept next to settings.ini between runs."""
+
+    def __init__(self, file: Path = TEMPLATE_CACHE):
+        self.file = file
+
+    def read(self, game_path: Path) -> Optional[dict[str, Any]]:
+        try:
+            with open(self.file, "rb") as f:
+                payload = pickle.load(f)
+        except Exception:
+            # missing, stale or corrupted cache, templates just get parsed again
+            return None
+
+        if not isinstance(payload, dict):
+            return None
+        if payload.get("version") != CACHE_VERSION:
+            return None
+        if payload.get("game_path") != Path(game_path).as_posix():
+            return None
+        return payload["state"]
+
+    def write(self, game_path: Path, state: dict[str, Any], cancelled: Optional[Callable[[], bool]] = None):
+        # cancelled is asked again before the cache is replaced, a load abandoned while it was being
+        # written leaves the cache of the load that superseded it alone
+        payload = {
+            "version": CACHE_VERSION,
+            "game_path": Path(game_path).as_posix(),
+            "state": state,
+        }
+
+        fd, temp_path = tempfile.mkstemp(dir=self.file.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            if cancelled is not None and cancelled():
+                os.remove(temp_path)
+                return
+            os.replace(temp_path, self.file)
+        except OSError:
+            # the cache is only a speed up, failing to write it is not an error
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def clear(self):
+        try:
+            os.remove(self.file)
+        except FileNotFoundError:
+            pass
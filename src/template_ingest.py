@@ -0,0 +1,154 @@
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import os
+from pathlib import Path
+import time
+from typing import Any, Callable, Optional
+from json_backend import loads
+
+# below this many files spinning up worker processes costs more than it saves
+PARALLEL_THRESHOLD = 64
+# files handed to a worker process per task, keeps pickling overhead down
+CHUNK_SIZE = 32
+
+def default_workers() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+def read_file(file: Path) -> bytes:
+    with file.open("rb") as f:
+        return f.read()
+
+def decode_json(raw: bytes) -> Any:
+    # same as json.load on a utf-8 text file
+    return loads(raw)
+
+def _decode_chunk(decode: Callable[[bytes], Any], chunk: list[bytes]) -> list[Any]:
+    return [decode(raw) for raw in chunk]
+
+class IngestEngine():
+    """Reads template folders with a thread pool and decodes them in a process pool."""
+
+    def __init__(self, workers: Optional[int] = None):
+        # workers <= 1 means everything runs serially on the calling thread
+        self.workers = default_workers() if workers is None else max(1, workers)
+        self.timings: dict[str, float] = {}
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._cpu_pool: Optional[Executor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._io_pool is not None:
+            self._io_pool.shutdown()
+            self._io_pool = None
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(cancel_futures=True)
+            self._cpu_pool = None
+
+    def load_folder(
+        self,
+        folder: Path,
+        name: Optional[str] = None,
+        decode: Callable[[bytes], Any] = decode_json,
+    ) -> dict[str, Any]:
+        return self.load_files(list(Path(folder).glob("*.json")), name or Path(folder).name, decode)
+
+    def load_files(
+        self,
+        files: list[Path],
+        name: str,
+        decode: Callable[[bytes], Any] = decode_json,
+    ) -> dict[str, Any]:
+        # decode must be a module level function so it can be sent to the worker processes
+        start = time.perf_counter()
+
+        if self.workers <= 1 or len(files) < PARALLEL_THRESHOLD:
+            values = [decode(read_file(file)) for file in files]
+        else:
+            try:
+                values = self._load_parallel(files, decode)
+            except BrokenProcessPool:
+                # process pool can't run here (frozen build, sandbox, ...), stay on this thread
+                self.close()
+                self.workers = 1
+                values = [decode(read_file(file)) for file in files]
+
+        self.timings[name] = time.perf_counter() - start
+        return {file.stem: value for file, value in zip(files, values)}
+
+    def _load_parallel(self, files: list[Path], decode: Callable[[bytes], Any]) -> list[Any]:
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=self.workers * 2)
+        if self._cpu_pool is None:
+            self._cpu_pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        # reading the next chunk overlaps with the previous chunk being decoded
+        futures = []
+        for i in range(0, len(files), CHUNK_SIZE):
+            raws = list(self._io_pool.map(read_file, files[i:i + CHUNK_SIZE]))
+            futures.append(self._cpu_pool.submit(_decode_chunk, decode, raws))
+
+        values: list[Any] = []
+        for future in futures:
+            values.extend(future.result())
+        return values
+
+class LazyTemplateFolder(Mapping[str, Any]):
+    """Template folder indexed by file stem, files are decoded on first access."""
+
+    def __init__(self, files: dict[str, Path], maxsize: int):
+        self.files = files
+        self.maxsize = maxsize
+        self._decoded: OrderedDict[str, Any] = OrderedDict()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._decoded:
+            self._decoded.move_to_end(key)
+            return self._decoded[key]
+
+        value = decode_json(read_file(self.files[key]))
+        self._decoded[key] = value
+        # least recently used templates are dropped, they are decoded again if needed
+        while len(self._decoded) > self.maxsize:
+            self._decoded.popitem(last=False)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.files
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        # the template if it's decoded already, nothing is read and the LRU order stays
+        return self._decoded.get(key, default)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def reindex(self, files: dict[str, Path], changed: set[str]) -> "LazyTemplateFolder":
+        # a copy over files, the decoded templates of unchanged files carry over
+        folder = LazyTemplateFolder(files, self.maxsize)
+        folder._decoded = OrderedDict(
+            (key, value) for key, value in self._decoded.items()
+            if key not in changed and key in files
+        )
+        return folder
+
+    def __getstate__(self):
+        # only the index goes into the template cache
+        return {"files": self.files, "maxsize": self.maxsize}
+
+    def __setstate__(self, state):
+        self.files = state["files"]
+        self.maxsize = state["maxsize"]
+        self._decoded = OrderedDict()
+
+def format_timings(timings: dict[str, float]) -> str:
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
@@ -0,0 +1,49 @@
+from pathlib import Path
+import threading
+from typing import Optional
+from PySide6.QtCore import QThread, Signal
+from template_cache import TemplateCache
+from template_store import LOAD_PHASES, LoadCancelled, TemplateLoadError, TemplateStore
+
+class TemplateLoader(QThread):
+    """Loads templates into a fresh TemplateStore off the GUI thread."""
+
+    # phase name, its 1 based position and the phase count
+    phaseStarted = Signal(str, int, int)
+    # the loaded store, only emitted if the load wasn't cancelled
+    templatesLoaded = Signal(object)
+    # the half loaded store and the error message
+    loadFailed = Signal(object, str)
+
+    def __init__(self, game_path: Path, store: TemplateStore, cache: Optional[TemplateCache] = None, parent=None):
+        super().__init__(parent)
+        self.game_path = Path(game_path)
+        # the store currently used by the UI is never touched, it's swapped for this one once loaded
+        self.store = store
+        self.cache = cache
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        # the load stops at the start of its next phase
+        self._cancel.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _on_phase(self, phase: str):
+        if self._cancel.is_set():
+            raise LoadCancelled(phase)
+        self.phaseStarted.emit(phase, LOAD_PHASES.index(phase) + 1, len(LOAD_PHASES))
+
+    def run(self):
+        try:
+            self.store.load_templates(self.game_path, self.cache, self._on_phase, self._cancel.is_set)
+        except LoadCancelled:
+            return
+        except TemplateLoadError as e:
+            if not self._cancel.is_set():
+                self.loadFailed.emit(self.store, str(e))
+            return
+
+        if not self._cancel.is_set():
+            self.templatesLoaded.emit(self.store)
@@ -0,0 +1,144 @@
+from bisect import bisect
+from typing import Any, Callable, Iterable, Optional
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, Qt
+from constants import EXCLUDED_ID_SUBSTRINGS, EXCLUDED_RAW_TYPES
+
+# (sort key, text, template key) of each listed entry
+_Entry = tuple[str, str, str]
+
+def unit_label(key: str, unit: dict[str, Any]) -> Optional[str]:
+    # test units and supply caravans can't be put in a regiment
+    uid = key.lower()
+    if any(sub in uid for sub in EXCLUDED_ID_SUBSTRINGS) or unit["RawUnitType"] in EXCLUDED_RAW_TYPES:
+        return None
+    return unit["Name"]
+
+def skill_label(key: str, skill: Any) -> Optional[str]:
+    return skill
+
+class TemplateItemModel(QAbstractListModel):
+    """Entries of a template as combo items, one model shared by every combo picking from it.
+
+    Row 0 is the empty choice, the entries follow sorted by text. The display role is the text,
+    with the key added when other entries show the same text, the user role the template key,
+    so currentData() of a combo is the key as before.
+    """
+
+    def __init__(self, label: Callable[[str, Any], Optional[str]], parent=None):
+        super().__init__(parent)
+        # text of an entry, None leaves it out
+        self.label = label
+        self._template: Optional[dict[str, Any]] = None
+        # built on first use after set_template, None until then
+        self._entries: Optional[list[_Entry]] = None
+        # template key -> row and text -> keys, rebuilt on first lookup after the rows changed
+        self._rows: Optional[dict[str, int]] = None
+        self._keys: Optional[dict[str, list[str]]] = None
+
+    def set_template(self, template: Optional[dict[str, Any]]):
+        self.beginResetModel()
+        self._template = template
+        self._entries = None
+        self._rows = self._keys = None
+        self.endResetModel()
+
+    def update(self, template: Optional[dict[str, Any]], keys: Iterable[str]):
+        # entries of keys added, renamed or removed in template, rows are moved rather than reset
+        # so combos keep their current item
+        entries = self._ensure()
+        self._template = template
+        # texts whose entries came or went, the others showing them may gain or lose their key
+        texts: set[str] = set()
+        for key in keys:
+            value = None if self._template is None else self._template.get(key)
+            text = None if value is None else self.label(key, value)
+            row = self.row(key)
+            if row > 0:
+                texts.add(entries[row - 1][1])
+            if text is not None:
+                texts.add(text)
+            if text is None:
+                if row > 0:
+                    self.beginRemoveRows(QModelIndex(), row, row)
+                    del entries[row - 1]
+                    self._rows = self._keys = None
+                    self.endRemoveRows()
+            elif row > 0:
+                self._move(row, (text.casefold(), text, key))
+            else:
+                entry = (text.casefold(), text, key)
+                position = bisect(entries, entry)
+                self.beginInsertRows(QModelIndex(), position + 1, position + 1)
+                entries.insert(position, entry)
+                self._rows = self._keys = None
+                self.endInsertRows()
+        for text in texts:
+            for key in self.keys(text):
+                index = self.index(self.row(key))
+                self.dataChanged.emit(index, index)
+
+    def _move(self, row: int, entry: _Entry):
+        # a new text may sort the entry elsewhere
+        entries = self._ensure()
+        old = row - 1
+        target = bisect(entries[:old] + entries[old + 1:], entry)
+        if target == old:
+            entries[old] = entry
+            self._keys = None
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+            return
+        # the destination is counted before the move, past the row itself when moving down
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), target + 1 if target < old else target + 2)
+        del entries[old]
+        entries.insert(target, entry)
+        self._rows = self._keys = None
+        self.endMoveRows()
+
+    def keys(self, text: str) -> list[str]:
+        # keys of the entries shown as text, names aren't unique so there may be several
+        if self._keys is None:
+            self._keys = {}
+            for entry in self._ensure():
+                self._keys.setdefault(entry[1], []).append(entry[2])
+        return self._keys.get(text, [])
+
+    def row(self, key: Any) -> int:
+        # row of a template key, 0 for None and -1 for keys not listed
+        if key is None:
+            return 0
+        if not isinstance(key, str):
+            return -1
+        if self._rows is None:
+            self._rows = {entry[2]: row for row, entry in enumerate(self._ensure(), 1)}
+        return self._rows.get(key, -1)
+
+    def _ensure(self) -> list[_Entry]:
+        if self._entries is None:
+            entries = []
+            for key, value in (self._template or {}).items():
+                text = self.label(key, value)
+                if text is not None:
+                    entries.append((text.casefold(), text, key))
+            entries.sort()
+            self._entries = entries
+        return self._entries
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._ensure()) + 1
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self.rowCount():
+            return None
+        row = index.row()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if row == 0:
+                return " "
+            _, text, key = self._ensure()[row - 1]
+            # localized names aren't unique, shared ones are told apart by their key
+            return f"{text} ({key})" if len(self.keys(text)) > 1 else text
+        if role == Qt.ItemDataRole.UserRole:
+            return None if row == 0 else self._ensure()[row - 1][2]
+        return None
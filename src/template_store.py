@@ -1,15 +1,48 @@
-from dataclasses import dataclass
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+import copy
+from dataclasses import dataclass, field
+from functools import partial
 import json
 from pathlib import Path
-from typing import Any, Optional, Protocol, TypeGuard
-from constants import BUST_DIR, FLAG_DIR, LOC_DIR, QUESTS_DIR, SKILLS_DIR, UNITS_DIR, UPGRADE_DIR
+import time
+from typing import Any, Callable, Iterable, Optional, Protocol, TypeGuard
+from constants import BUST_CACHE_SIZE, BUST_DIR, FLAG_DIR, LOC_DIR, QUESTS_DIR, SKILLS_DIR, UNITS_DIR, UPGRADE_DIR
+from json_backend import load_file
+from json_scan import decode_span, find_span, object_members
+from loc_store import LocStore, iter_terms
+from template_cache import Fingerprint, TemplateCache, fingerprint
+from template_ingest import IngestEngine, LazyTemplateFolder
+from upgrade_index import UpgradeIndex
+
+TEMPLATE_FILES = (UNITS_DIR, UPGRADE_DIR, FLAG_DIR, LOC_DIR)
+TEMPLATE_FOLDERS = (BUST_DIR, QUESTS_DIR, SKILLS_DIR)
+# every GameData subfolder holding a template, watched for hot reload
+TEMPLATE_DIRS = tuple(dict.fromkeys([*(file.parent for file in TEMPLATE_FILES), *TEMPLATE_FOLDERS]))
+# reported in this order to the progress callback of load_templates
+LOAD_PHASES = ("units", "upgrades", "flags", "busts", "skills", "localization")
+
+# everything needed to restore a loaded store without touching the game files
+CACHED_FIELDS = (
+    "unit_template",
+    "upgrade_template",
+    "flag_template",
+    "bust_template",
+    "loc_dict",
+    "skill_template",
+    "unit_name_keys",
+    "quest_skill_refs",
+    "skill_ids",
+    "loc_keys",
+    "fingerprints",
+)
 
 class LoadedTemplateStore(Protocol):
     unit_template: dict[str, dict[str, Any]]
     upgrade_template: dict[str, Any]
     flag_template: dict[str, Any]
-    bust_template: dict[str, Any]
-    loc_dict: dict[str, str]
+    bust_template: Mapping[str, Any]
+    loc_dict: LocStore
     skill_template: dict[str, Any]
     
 @dataclass
@@ -18,68 +51,58 @@ class TemplateStore():
     unit_template: Optional[dict[str, dict[str, Any]]] = None
     upgrade_template: Optional[dict[str, Any]] = None
     flag_template: Optional[dict[str, Any]] = None
-    bust_template: Optional[dict[str, Any]] = None
-    loc_dict: Optional[dict[str, str]] = None
+    # busts are only indexed, see LazyTemplateFolder
+    bust_template: Optional[LazyTemplateFolder] = None
+    # packed into buffers, see LocStore
+    loc_dict: Optional[LocStore] = None
     skill_template: Optional[dict[str, Any]] = None
+    # derived from upgrade_template, rebuilt whenever it changes
+    upgrade_index: UpgradeIndex = field(default_factory=UpgradeIndex)
+    
+    # None picks a worker count from the cpu count, 1 loads serially
+    workers: Optional[int] = None
+    # seconds spent on each phase of the last load, listing and fingerprinting the files included
+    load_timings: dict[str, float] = field(default_factory=dict)
         
-    def load_templates(self, game_path):
+    # raw values from before localization, lets a single changed file be re-ingested
+    unit_name_keys: dict[str, Any] = field(default_factory=dict)
+    # quest file stem -> (quest ID, tooltip header key or None)
+    quest_skill_refs: dict[str, tuple[Any, Optional[str]]] = field(default_factory=dict)
+    skill_ids: set[str] = field(default_factory=set)
+    # False keeps only the terms units and skills refer to, the dev tab needs them all
+    full_localization: bool = True
+    # the keys loc_dict was filtered to, None when it holds every term
+    loc_keys: Optional[frozenset[str]] = None
+    # game path relative file -> fingerprint of the version currently loaded
+    fingerprints: dict[str, Fingerprint] = field(default_factory=dict)
+
+    def load_templates(
+        self,
+        game_path,
+        cache: Optional[TemplateCache] = None,
+        progress: Optional[Callable[[str], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ):
+        # progress is called with each of LOAD_PHASES, raising LoadCancelled from it stops the load
+        # cancelled tells a load that was abandoned anyway, its result is never written to the cache
         # if game path invalid
         path = Path(game_path)
         
         try:
-            # Loading Unit Templates
-            with open(path / UNITS_DIR, "r", encoding="utf-8") as f:
-                unit_template_list = json.load(f)
+            self.load_timings = {}
             
-            self.unit_template = {unit["ID"]: unit for unit in unit_template_list}
+            if cache is not None:
+                state = cache.read(path)
+                if state is not None:
+                    self.restore_state(state)
+                else:
+                    self.fingerprints = {}
             
-            # Loading Upgrade Templates
-            with open(path / UPGRADE_DIR, "r", encoding="utf-8") as f:
-                upgrade_template_list = json.load(f)
+            # only files whose fingerprint differs from the loaded version get parsed
+            changed = self.refresh(path, progress=progress)
             
-            self.upgrade_template = upgrade_template_list
-            
-            # Loading Flag Templates
-            with open(path / FLAG_DIR, "r", encoding="utf-8") as f:
-                flag_template_list = json.load(f)
-            
-            self.flag_template = flag_template_list["FlagTemplates"]
-                
-            # Loading Bust Templates
-            bust_templates = {}
-            folder_path = Path(path / BUST_DIR)
-            for file in folder_path.glob("*.json"):
-                with file.open("r", encoding="utf-8") as f:
-                    bust_templates[file.stem] = json.load(f)
-            
-            self.bust_template = bust_templates
-            
-            # Loading Skills Templates
-            # the skill system of the game is convoluted, their definition are under Quests along other stuff like stratagems, etc.
-            quests_templates = {}
-            folder_path = Path(path / QUESTS_DIR)
-            for file in folder_path.glob("*.json"):
-                with file.open("r", encoding="utf-8") as f:
-                    quests_templates[file.stem] = json.load(f)
-                    
-            skills_templates = {}
-            folder_path = Path(path / SKILLS_DIR)
-            for file in folder_path.glob("*.json"):
-                with file.open("r", encoding="utf-8") as f:
-                    skills_templates[file.stem] = json.load(f)
-                    
-            self.skill_template = {
-                quest.get("ID"): quest.get("TooltipNodes")[0]["HeaderKey"] 
-                for quest in quests_templates.values() 
-                if quest.get("ID") in skills_templates.keys()
-                and quest.get("TooltipNodes")
-            }
-            
-            # Loading Localization Templates
-            with open(path / LOC_DIR, "r", encoding="utf-8") as f:
-                loc = json.load(f)["Terms"]
-        
-            self.setup_loc(loc)
+            if cache is not None and changed and not (cancelled is not None and cancelled()):
+                cache.write(path, self.cache_state(), cancelled)
             
         except FileNotFoundError as e:
             raise TemplateLoadError(f"Missing file: {path}") from e
@@ -90,26 +113,233 @@ class TemplateStore():
         except TemplateLoadError:
             self.unit_template = None
             self.upgrade_template = None
+            self.upgrade_index = UpgradeIndex()
             self.flag_template = None
             self.bust_template = None
             self.skill_template = None
             self.loc_dict = None
             raise
         
-    def setup_loc(self, loc):
-        if self.unit_template is None:
-            return
-        if self.skill_template is None:
-            return
+    def refresh(
+        self,
+        path: Path,
+        folders: Optional[Iterable[Path]] = None,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> "TemplateChanges":
+        # folders limits the rescan to some of TEMPLATE_FOLDERS, the others keep their last listing
+        with _timed(self.load_timings, "Scan"):
+            files = self.scan_files(path, folders)
+
+            current: dict[str, Fingerprint] = {}
+            changed: set[str] = set()
+            for rel, file in files.items():
+                previous = self.fingerprints.get(rel)
+                current[rel] = fingerprint(file, previous)
+                if previous is None or current[rel].digest != previous.digest:
+                    changed.add(rel)
+            changed.update(self.fingerprints.keys() - current.keys())
+
+        # switching to the dev tab needs every term, not just the filtered ones
+        if not self._loc_covers(None if self.full_localization else self.referenced_loc_keys()):
+            changed.add(LOC_DIR.as_posix())
+
+        if not changed:
+            return TemplateChanges()
+
+        # ingested into a copy, a file that fails halfway leaves this store as it was
+        staged = self._staged()
+        changes = staged.ingest(path, files, changed, progress)
+        staged.fingerprints = current
+        self.__dict__.update(staged.__dict__)
+        return changes
+
+    def _staged(self) -> "TemplateStore":
+        # ingest replaces or merges into these, everything else it only reassigns
+        staged = copy.copy(self)
+        for name in ("unit_template", "upgrade_template", "flag_template", "skill_template", "load_timings"):
+            value = getattr(self, name)
+            if value is not None:
+                setattr(staged, name, copy.copy(value))
+        return staged
+
+    def scan_files(self, path: Path, folders: Optional[Iterable[Path]] = None) -> dict[str, Path]:
+        rescan = set(TEMPLATE_FOLDERS if folders is None else folders)
+
+        files = {rel.as_posix(): path / rel for rel in TEMPLATE_FILES}
+        for folder in TEMPLATE_FOLDERS:
+            if folder in rescan:
+                for file in (path / folder).glob("*.json"):
+                    files[(folder / file.name).as_posix()] = file
+            else:
+                files.update(self._folder_files({rel: path / rel for rel in self.fingerprints}, folder))
+        return files
+
+    def ingest(
+        self,
+        path: Path,
+        files: dict[str, Path],
+        changed: set[str],
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> "TemplateChanges":
+        changes = TemplateChanges(files=set(changed))
+        if progress is None:
+            progress = lambda phase: None
+
+        # Loading Unit Templates
+        progress("units")
+        units = None
+        if UNITS_DIR.as_posix() in changed or self.unit_template is None:
+            with _timed(self.load_timings, "Units"), _reading(path / UNITS_DIR):
+                unit_template_list = load_file(path / UNITS_DIR)
+
+                units = {unit["ID"]: unit for unit in unit_template_list}
+                self.unit_name_keys = {key: unit.get("Name") for key, unit in units.items()}
+
+        # Loading Upgrade Templates
+        progress("upgrades")
+        if UPGRADE_DIR.as_posix() in changed or self.upgrade_template is None:
+            with _timed(self.load_timings, "Upgrades"), _reading(path / UPGRADE_DIR):
+                upgrade_template_list = load_file(path / UPGRADE_DIR)
+
+                self.upgrade_template, changes.upgrades = merge_entries(self.upgrade_template, upgrade_template_list)
+                if changes.upgrades:
+                    self.upgrade_index = UpgradeIndex.build(self.upgrade_template)
+
+        # Loading Flag Templates
+        progress("flags")
+        if FLAG_DIR.as_posix() in changed or self.flag_template is None:
+            with _timed(self.load_timings, "Flags"), _reading(path / FLAG_DIR):
+                flag_template_list = load_file(path / FLAG_DIR)
+
+                self.flag_template, changes.flags = merge_entries(self.flag_template, flag_template_list["FlagTemplates"])
+
+        # Loading Bust Templates
+        progress("busts")
+        # only one bust is needed per unit type change, they get decoded when first used
+        with _timed(self.load_timings, "Busts"):
+            bust_files = self._folder_files(files, BUST_DIR)
+            bust_index = {file.stem: file for file in bust_files.values()}
+            if self.bust_template is None:
+                self.bust_template = LazyTemplateFolder(bust_index, BUST_CACHE_SIZE)
+                changes.busts = set(bust_index)
+            else:
+                changes.busts = {
+                    file.stem for rel, file in bust_files.items()
+                    if rel in changed
+                }
+                changes.busts.update(bust_index.keys() ^ self.bust_template.files.keys())
+                self.bust_template = self.bust_template.reindex(bust_index, changes.busts)
+
+        # Loading Skills Templates
+        progress("skills")
+        # the skill system of the game is convoluted, their definition are under Quests along other stuff like stratagems, etc.
+        # only the names of the skill files matter, their content is never read
+        with _timed(self.load_timings, "Skills"):
+            skill_ids = {file.stem for file in self._folder_files(files, SKILLS_DIR).values()}
+            # quests that didn't match before but now name a skill need their header key
+            new_skills = skill_ids - self.skill_ids
+            self.skill_ids = skill_ids
+            requeue = {
+                stem for stem, (quest_id, _) in self.quest_skill_refs.items()
+                if quest_id in new_skills
+            }
+
+        # decoded in worker processes, an error is only known by its folder
+        with _timed(self.load_timings, "Quests"), IngestEngine(self.workers) as engine, _reading(path / QUESTS_DIR):
+            self.quest_skill_refs = self._ingest_folder(
+                engine, files, changed, QUESTS_DIR, self.quest_skill_refs,
+                partial(decode_skill_ref, frozenset(skill_ids)), requeue
+            )
+
+        # Loading Localization Templates
+        progress("localization")
+        wanted = None if self.full_localization else self.referenced_loc_keys()
+        if LOC_DIR.as_posix() in changed or not self._loc_covers(wanted):
+            # terms are streamed straight out of the file, the document is never built
+            with _timed(self.load_timings, "Localization"), _reading(path / LOC_DIR):
+                loc_dict = LocStore.from_pairs(iter_terms(path / LOC_DIR, wanted))
+            # the packed store can't be patched in place, it's swapped whole
+            changes.loc = set(loc_dict) if self.loc_dict is None else self.loc_dict.changed_keys(loc_dict)
+            self.loc_dict = loc_dict
+            self.loc_keys = None if wanted is None else frozenset(wanted)
+
+        with _reading(path / UNITS_DIR):
+            changes.units, changes.skills = self.localize(units)
+        return changes
+
+    def referenced_loc_keys(self) -> set[str]:
+        keys = {str(name_key) for name_key in self.unit_name_keys.values()}
+        keys.update(
+            header_key
+            for quest_id, header_key in self.quest_skill_refs.values()
+            if quest_id in self.skill_ids
+            and isinstance(header_key, str)
+        )
+        return keys
+
+    def _loc_covers(self, wanted: Optional[set[str]]) -> bool:
+        if self.loc_dict is None:
+            return False
+        if self.loc_keys is None:
+            return True
+        return wanted is not None and wanted <= self.loc_keys
+
+    def _folder_files(self, files: dict[str, Path], folder: Path) -> dict[str, Path]:
+        prefix = folder.as_posix() + "/"
+        return {rel: file for rel, file in files.items() if rel.startswith(prefix)}
+
+    def _ingest_folder(self, engine, files, changed, folder, previous, decode, requeue=frozenset()) -> dict[str, Any]:
+        folder_files = self._folder_files(files, folder)
+
+        if previous is None:
+            previous = {}
+        stale = [
+            file for rel, file in folder_files.items()
+            if rel in changed or file.stem not in previous or file.stem in requeue
+        ]
+        fresh = engine.load_files(stale, folder.name, decode)
+
+        return {
+            file.stem: fresh[file.stem] if file.stem in fresh else previous[file.stem]
+            for file in folder_files.values()
+        }
+
+    def localize(self, units: Optional[dict[str, dict[str, Any]]] = None) -> tuple[set[str], set[str]]:
+        # units are freshly parsed templates, None re-localizes the loaded ones, a renamed entry is replaced
+        # returns the unit and skill ids whose entry changed
+        if self.loc_dict is None:
+            return set(), set()
             
-        self.loc_dict = {
-            item["Key"]: item["Translation"]
-            for item in loc
+        unit_changes: set[str] = set()
+        if units is not None:
+            for key, value in units.items():
+                value["Name"] = self.loc_dict.get(str(self.unit_name_keys.get(key)))
+            self.unit_template, unit_changes = merge_entries(self.unit_template, units)
+        elif self.unit_template is not None:
+            for key, value in list(self.unit_template.items()):
+                name = self.loc_dict.get(str(self.unit_name_keys.get(key)))
+                if value["Name"] != name:
+                    # a copy, the entry may still be read from a store this one was staged from
+                    self.unit_template[key] = {**value, "Name": name}
+                    unit_changes.add(key)
+
+        skills = {
+            quest_id: self.loc_dict.get(header_key)
+            for quest_id, header_key in self.quest_skill_refs.values()
+            if quest_id in self.skill_ids
+            and header_key is not None
         }
-        for key, value in self.unit_template.items():
-            self.unit_template[key]["Name"] = self.loc_dict.get(str(value.get("Name")))
-        for key, value in self.skill_template.items():
-            self.skill_template[key] = self.loc_dict.get(value)
+        self.skill_template, skill_changes = merge_entries(self.skill_template, skills)
+
+        return unit_changes, skill_changes
+
+    def cache_state(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in CACHED_FIELDS}
+
+    def restore_state(self, state: dict[str, Any]):
+        for name in CACHED_FIELDS:
+            setattr(self, name, state[name])
+        self.upgrade_index = UpgradeIndex.build(self.upgrade_template)
 
     def missing_templates(self) -> list[str]:
         missing: list[str] = []
@@ -130,10 +360,91 @@ class TemplateStore():
     def is_loaded(self) -> bool:
         return not self.missing_templates()
     
+@dataclass
+class TemplateChanges():
+    """Keys of each template touched by a refresh."""
+
+    files: set[str] = field(default_factory=set)
+    units: set[str] = field(default_factory=set)
+    upgrades: set[str] = field(default_factory=set)
+    flags: set[str] = field(default_factory=set)
+    busts: set[str] = field(default_factory=set)
+    skills: set[str] = field(default_factory=set)
+    loc: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.files)
+
 class TemplateLoadError(Exception):
     """Raised when game templates fail to load."""
     pass
+
+class LoadCancelled(Exception):
+    """Raised by a progress callback to abandon a template load."""
+    pass
+
+@contextmanager
+def _timed(timings: dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+
+@contextmanager
+def _reading(file: Path) -> Iterator[None]:
+    # a missing or damaged template file, reported with its name instead of escaping as a bare
+    # KeyError or TypeError from whatever read it
+    try:
+        yield
+    except FileNotFoundError as e:
+        raise TemplateLoadError(f"Missing file: {file}") from e
+    except json.JSONDecodeError as e:
+        raise TemplateLoadError(f"Invalid JSON: {file}\n{e}") from e
+    except OSError as e:
+        raise TemplateLoadError(f"Could not read: {file}\n{e}") from e
+    except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+        raise TemplateLoadError(f"Unexpected content: {file}\n{type(e).__name__}: {e}") from e
+    
+def merge_entries(current: Optional[dict[str, Any]], new: dict[str, Any]) -> tuple[dict[str, Any], set[str]]:
+    # updates current in place so untouched entries keep their identity
+    if current is None:
+        return new, set(new.keys())
+
+    changed = current.keys() - new.keys()
+    for key in changed:
+        del current[key]
+    for key, value in new.items():
+        if key not in current or current[key] != value:
+            current[key] = value
+            changed.add(key)
+    return current, changed
     
+def decode_skill_ref(skill_ids: frozenset[str], raw: bytes) -> tuple[Any, Optional[str]]:
+    # reads the quest ID and, for skills only, the first tooltip header key
+    # everything else in the quest is skipped over without being decoded
+    quest_id = None
+    nodes_at = None
+    for key, start, end in object_members(raw):
+        if key == "ID":
+            quest_id = decode_span(raw, start, end)
+            if quest_id not in skill_ids:
+                return quest_id, None
+            if nodes_at is not None:
+                break
+        elif key == "TooltipNodes":
+            nodes_at = start
+            if quest_id is not None:
+                break
+
+    if quest_id not in skill_ids or nodes_at is None:
+        return quest_id, None
+
+    span = find_span(raw, (0, "HeaderKey"), nodes_at)
+    if span is None:
+        return quest_id, None
+    return quest_id, decode_span(raw, *span)
+
 def templates_ready(store: TemplateStore) -> TypeGuard[LoadedTemplateStore]:
     return (
         store.unit_template is not None
@@ -142,4 +453,4 @@ def templates_ready(store: TemplateStore) -> TypeGuard[LoadedTemplateStore]:
         and store.bust_template is not None
         and store.loc_dict is not None
         and store.skill_template is not None
-    )
\ No newline at end of file
+    )
@@ -0,0 +1,98 @@
+from pathlib import Path
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+from template_store import TEMPLATE_DIRS, TEMPLATE_FILES, TEMPLATE_FOLDERS
+
+# game updates and mod tools write many files at once, wait for them to settle
+RELOAD_DELAY_MS = 500
+
+class TemplateWatcher(QObject):
+    # GameData subfolders, relative to the game path, that had files change
+    templatesChanged = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.game_path: Path | None = None
+        self._pending: set[Path] = set()
+        # file name to mtime and size for each watched folder, as last reported
+        self._stats: dict[Path, dict[str, tuple[int, int]]] = {}
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(RELOAD_DELAY_MS)
+        self._timer.timeout.connect(self._emit_changes)
+
+    def watch(self, game_path: Path):
+        self.stop()
+        self.game_path = Path(game_path)
+        folders = [folder for folder in TEMPLATE_DIRS if (self.game_path / folder).is_dir()]
+        self._stats = {folder: self._scan(folder) for folder in folders}
+        # one watch per folder, a game folder holds thousands of bust and quest files
+        # in place edits don't touch the directory, so the few single files are watched too
+        self._watcher.addPaths([str(self.game_path / folder) for folder in folders])
+        self._watcher.addPaths([str(self.game_path / file) for file in TEMPLATE_FILES if (self.game_path / file).is_file()])
+
+    def stop(self):
+        self._timer.stop()
+        self._pending.clear()
+        self._stats.clear()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _scan(self, folder: Path) -> dict[str, tuple[int, int]]:
+        # mtime and size of every template file directly in folder
+        assert self.game_path is not None
+        files = [self.game_path / file for file in TEMPLATE_FILES if file.parent == folder]
+        if folder in TEMPLATE_FOLDERS:
+            files.extend((self.game_path / folder).glob("*.json"))
+
+        stats = {}
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            stats[file.name] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def _on_path_changed(self, changed: str):
+        if self.game_path is None:
+            return
+
+        path = Path(changed)
+        try:
+            rel = path.relative_to(self.game_path)
+        except ValueError:
+            return
+
+        folder = rel if rel in TEMPLATE_DIRS else rel.parent
+        self._pending.add(folder)
+        self._timer.start()
+
+    def _emit_changes(self):
+        if not self._pending:
+            return
+        pending = sorted(self._pending)
+        self._pending.clear()
+
+        # editors that save by replacing a file drop it from the watcher, a removed folder goes too
+        watched = set(self._watcher.files() + self._watcher.directories())
+        paths = [self.game_path / folder for folder in pending]
+        paths.extend(self.game_path / file for file in TEMPLATE_FILES if file.parent in pending)
+        missing = [str(path) for path in paths if str(path) not in watched and path.exists()]
+        if missing:
+            self._watcher.addPaths(missing)
+
+        # only folders whose files changed, temp files and touched folders don't reload anything
+        folders = []
+        for folder in pending:
+            stats = self._scan(folder)
+            if stats != self._stats.get(folder):
+                self._stats[folder] = stats
+                folders.append(folder)
+        if folders:
+            self.templatesChanged.emit(folders)
@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget
+
+def _enabled(widget) -> bool:
+    # isEnabled is False under a disabled parent, what setEnabled changed is the attribute
+    if isinstance(widget, QWidget):
+        return not widget.testAttribute(Qt.WidgetAttribute.WA_Disabled)
+    return widget.isEnabled()
+
+# property -> how it's read and written
+PROPERTIES: dict[str, tuple[Callable[[Any], Any], str]] = {
+    "enabled": (_enabled, "setEnabled"),
+    "value": (lambda widget: widget.value(), "setValue"),
+    "checked": (lambda widget: widget.isChecked(), "setChecked"),
+    "index": (lambda widget: widget.currentIndex(), "setCurrentIndex"),
+    "text": (lambda widget: widget.text(), "setText"),
+}
+
+class UiBatch():
+    """Widget changes collected and applied together.
+
+    Inside a transaction set only records the state a widget should end up in, so a widget reset
+    and then set again is changed once, or not at all. On commit the root stops painting, the
+    properties that differ from the widgets are applied with signals blocked and it repaints once.
+    Outside a transaction set applies right away, still only when the value differs.
+    """
+
+    def __init__(self, root: QWidget):
+        self.root = root
+        # (widget, property) -> (widget, property, value), in the order first set
+        self._pending: dict[tuple[int, str], tuple[Any, str, Any]] = {}
+        self._depth = 0
+        # widget changes the last transaction made, and all made since startup
+        self.last_mutations = 0
+        self.mutations = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator["UiBatch"]:
+        # nested transactions are part of the outermost one
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self._commit()
+
+    def set(self, widget, prop: str, value: Any):
+        if prop == "value":
+            # a spinbox keeps its value in range, compared unclamped it would differ every time
+            value = max(widget.minimum(), min(value, widget.maximum()))
+        if self._depth:
+            self._pending[(id(widget), prop)] = (widget, prop, value)
+        elif self._apply(widget, prop, value):
+            self.mutations += 1
+
+    def get(self, widget, prop: str) -> Any:
+        # what the widget will show once the transaction is applied
+        pending = self._pending.get((id(widget), prop))
+        if pending is not None:
+            return pending[2]
+        return PROPERTIES[prop][0](widget)
+
+    def _commit(self):
+        pending, self._pending = self._pending, {}
+        count = 0
+        updates = self.root.updatesEnabled()
+        self.root.setUpdatesEnabled(False)
+        try:
+            for widget, prop, value in pending.values():
+                count += self._apply(widget, prop, value)
+        finally:
+            self.root.setUpdatesEnabled(updates)
+        self.last_mutations = count
+        self.mutations += count
+
+    def _apply(self, widget, prop: str, value: Any) -> bool:
+        read, setter = PROPERTIES[prop]
+        if read(widget) == value:
+            return False
+        blocked = widget.blockSignals(True)
+        getattr(widget, setter)(value)
+        widget.blockSignals(blocked)
+        return True
@@ -1,10 +1,12 @@
 
 
-from PySide6.QtWidgets import QSpinBox, QComboBox, QTreeWidgetItem, QLabel, QPushButton, QCheckBox, QWidget
+from PySide6.QtWidgets import QSpinBox, QComboBox, QLabel, QPushButton, QCheckBox
 from PySide6.QtGui import QAction
+from ui_batch import UiBatch
 class UIHelperMixin:
     
     # for typehints
+    ui_batch: UiBatch
     goldSpinBox: QSpinBox
     supplySpinBox: QSpinBox
     ammoSpinBox: QSpinBox
@@ -118,6 +120,8 @@ class UIHelperMixin:
             for i in range(1, 6)
         ]
     
+    # these only record the state widgets should end up in when called in a transaction,
+    # see UiBatch, a widget reset here and then set from the save is changed once
     def refresh_ui(self):
         self.reset_army_spinboxes()
         self.reset_army_comboboxes()
@@ -132,9 +136,7 @@ class UIHelperMixin:
             *self.reserve_spinboxes,
         ]
         for w in spinboxes:
-            w.blockSignals(True)
-            w.setValue(0)
-            w.blockSignals(False)
+            self.ui_batch.set(w, "value", 0)
     
     def reset_army_comboboxes(self):
         comboboxes = [
@@ -142,9 +144,7 @@ class UIHelperMixin:
             *self.reserve_combos,
         ]
         for w in comboboxes:
-            w.blockSignals(True)
-            w.setCurrentIndex(0)
-            w.blockSignals(False)
+            self.ui_batch.set(w, "index", 0)
     
     def reset_leader_spinboxes(self):
         spinboxes = [
@@ -154,9 +154,7 @@ class UIHelperMixin:
             *self.reserve_leader_skillpoints_spinbox,
         ]
         for w in spinboxes:
-            w.blockSignals(True)
-            w.setValue(0)
-            w.blockSignals(False)
+            self.ui_batch.set(w, "value", 0)
     
     def reset_leader_comboboxes(self):
         comboboxes = [
@@ -164,9 +162,7 @@ class UIHelperMixin:
             *self.reserve_leader_skill_combos,
         ]
         for w in comboboxes:
-            w.blockSignals(True)
-            w.setCurrentIndex(0)
-            w.blockSignals(False)
+            self.ui_batch.set(w, "index", 0)
             
     def reset_leader_labels(self):
         comboboxes = [
@@ -174,61 +170,7 @@ class UIHelperMixin:
             *self.reserve_leader_label
         ]
         for w in comboboxes:
-            w.blockSignals(True)
-            w.setText("")
-            w.blockSignals(False)
-    
-    def set_original_values(self):
-        widgets = [
-            *self.resource_spinboxes,
-            # regiment
-            *self.regiment_combos,
-            *self.regiment_spinboxes,
-            # reserve regiments
-            *self.reserve_combos,
-            *self.reserve_spinboxes,
-            # leader
-            *self.leader_label,
-            *self.leader_skill_combos,
-            *self.leader_level_spinbox,
-            *self.leader_skillpoints_spinbox,
-            # reserve_leader
-            *self.reserve_leader_label,
-            *self.reserve_leader_skill_combos,
-            *self.reserve_leader_level_spinbox,
-            *self.reserve_leader_skillpoints_spinbox,
-        ]
-        for w in widgets:
-            self._set_original_value(w)
-    
-    def _detect_changed_value(self, widget: QWidget, current):
-        value = widget.property("originalValue")
-        old = value if value != "" else None
-        return (current != old)
-    
-    def _set_original_value(self, widget):
-        if isinstance(widget, QComboBox):
-            widget.setProperty("originalValue", widget.currentData() or "")
-        elif isinstance(widget, QSpinBox):
-            widget.setProperty("originalValue", widget.value())
-        elif isinstance(widget, QCheckBox):
-            widget.setProperty("originalValue", widget.isChecked())
-        elif isinstance(widget, QLabel):
-            widget.setProperty("originalValue", widget.text())
-        
-    def add_dict_to_tree(self, parent, data):
-        for k, v in data.items():
-            item = QTreeWidgetItem([str(k)])
-
-            if isinstance(v, dict):
-                self.add_dict_to_tree(item, v)
-            elif isinstance(v, list):
-                for i, val in enumerate(v):
-                    self.add_dict_to_tree(item, {f"[{i}]": val})
-            else:
-                item.setText(1, str(v))
-
-            parent.addChild(item)
+            self.ui_batch.set(w, "text", "")
     
     def on_load_file_UI_handler(self, divisions_enabled: int, reserve_leaders: int):
         # Maybe define proper division ui in future
@@ -238,7 +180,7 @@ class UIHelperMixin:
         
         for i in range(reserve_leaders):
             skill_start = i * 5
-            if (self.reserve_leader_label[i].text()):
+            if (self.ui_batch.get(self.reserve_leader_label[i], "text")):
                 self.enable_widgets([self.reserve_leader_label[i]])
                 self.enable_widgets([self.reserve_leader_level_spinbox[i]])
                 self.enable_widgets([self.reserve_leader_skillpoints_spinbox[i]])
@@ -260,7 +202,7 @@ class UIHelperMixin:
             
             if i != 0:
                 self.enable_widgets([self.division_checkboxes[i]], set_bool)
-            self.division_checkboxes[i].setChecked(set_bool)
+            self.ui_batch.set(self.division_checkboxes[i], "checked", set_bool)
             self.enable_widgets([self.leader_label[i]], set_bool)
             
             reg_start = i * 4
@@ -268,7 +210,7 @@ class UIHelperMixin:
             self.enable_widgets(self.regiment_spinboxes[reg_start: reg_start + 4], set_bool)
         
             skill_start = i * 5
-            if (self.leader_label[i].text()):
+            if (self.ui_batch.get(self.leader_label[i], "text")):
                 self.enable_widgets([self.leader_level_spinbox[i]])
                 self.enable_widgets([self.leader_skillpoints_spinbox[i]])
                 self.enable_widgets(self.leader_skill_combos[skill_start: skill_start + 5])
@@ -279,9 +221,7 @@ class UIHelperMixin:
                 
     def enable_widgets(self, widgets: list, enable: bool = True):
         for w in widgets:
-            w.blockSignals(True)
-            w.setEnabled(enable)
-            w.blockSignals(False)
+            self.ui_batch.set(w, "enabled", enable)
         
     def disable_all_widgets(self):
         widgets = [
@@ -310,8 +250,6 @@ class UIHelperMixin:
             *self.create_reserve_leader_buttons,
         ]
         for w in widgets:
-            w.blockSignals(True)
             if isinstance(w, QCheckBox):
-                w.setChecked(False)
-            w.setEnabled(False)
-            w.blockSignals(False)
\ No newline at end of file
+                self.ui_batch.set(w, "checked", False)
+            self.ui_batch.set(w, "enabled", False)
\ No newline at end of file
@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+@dataclass
+class UpgradeIndex():
+    """Upgrade tree and prerequisite closure of every unit, built once per load of UpgradeTrees.json."""
+
+    # unit id -> id of the first tree listing it, the same tree a scan of upgrade_template finds
+    trees: dict[str, str] = field(default_factory=dict)
+    # unit id -> every unit it requires, directly or not, each unit listed before its own prerequisites
+    prerequisites: dict[str, tuple[str, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, upgrade_template: Optional[dict[str, Any]]) -> "UpgradeIndex":
+        index = cls()
+        if not upgrade_template:
+            return index
+
+        for tree_id, tree in upgrade_template.items():
+            items = tree["Items"]
+            for unit_id in items:
+                if unit_id in index.trees:
+                    continue
+                index.trees[unit_id] = tree_id
+                index.prerequisites[unit_id] = prerequisite_closure(unit_id, items)
+        return index
+
+    def lookup(self, unit_id: str) -> tuple[Optional[str], list[str]]:
+        # (tree id, prerequisites) as stored in a regiment, (None, []) for units outside every tree
+        tree_id = self.trees.get(unit_id)
+        if tree_id is None:
+            return None, []
+        return tree_id, list(self.prerequisites[unit_id])
+
+def _direct_prerequisites(items: dict[str, Any], unit_id: str) -> list[str]:
+    item = items.get(unit_id)
+    if not isinstance(item, dict):
+        return []
+    return item.get("Prerequisite") or []
+
+def prerequisite_closure(unit_id: str, items: dict[str, Any]) -> tuple[str, ...]:
+    # reversed post-order of a depth first walk: a unit comes before anything it requires,
+    # shared ancestors are listed once and a cycle is cut where it closes
+    order: list[str] = []
+    done = {unit_id}
+    # (unit, iterator over its prerequisites), an explicit stack so deep trees can't hit the recursion limit
+    stack = [(unit_id, iter(_direct_prerequisites(items, unit_id)))]
+    while stack:
+        current, pending = stack[-1]
+        for prerequisite in pending:
+            if prerequisite not in done:
+                done.add(prerequisite)
+                # prerequisites missing from the tree are kept but have nothing to expand
+                stack.append((prerequisite, iter(_direct_prerequisites(items, prerequisite))))
+                break
+        else:
+            stack.pop()
+            if current != unit_id:
+                order.append(current)
+    order.reverse()
+    return tuple(order)
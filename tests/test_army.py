@@ -0,0 +1,67 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from army import Army, Division, Officer, Regiment
+from constants import NEW_UNIT_TEMPLATE
+from save_intern import SHARED_TYPES, intern_document, writable
+
+ARMY = ("PlayerSaveData", "ArmySaveData")
+
+def _save() -> dict:
+    # interned like an opened save, every regiment shares the same structures
+    regiment = json.loads(NEW_UNIT_TEMPLATE)
+    army = {
+        "Divisions": [{"Name": "First", "OfficerSave": None, "Regiments": [regiment, regiment, None, None]}],
+        "ReserveRegiments": [regiment, None],
+        "ReserveOfficers": [None, None],
+    }
+    return intern_document({"PlayerSaveData": {"Cash": 1, "ArmySaveData": army}})
+
+class SharedSetterTest(unittest.TestCase):
+    def test_army_setters(self):
+        data = _save()
+        army = Army(writable(data, ARMY))
+        army.set_reserve_regiment(1, army.reserve_regiments[0])
+        army.set_reserve_officer(0, Officer.new())
+        self.assertIs(army.reserve_regiments[1].data, army.reserve_regiments[0].data)
+        self.assertEqual(army.reserve_officers[0].full_name, Officer.new().full_name)
+
+    def test_division_setters(self):
+        data = _save()
+        division = Division(writable(data, ARMY + ("Divisions", 0)))
+        division.set_regiment(3, division.regiments[0])
+        division.officer = Officer.new()
+        self.assertEqual(sum(regiment is not None for regiment in division.regiments), 3)
+        self.assertIsNotNone(division.officer)
+
+    def test_inventory_setters(self):
+        data = _save()
+        path = ARMY + ("Divisions", 0, "Regiments", 0)
+        inventory = Regiment(writable(data, path)).inventory
+        inventory.melee_weapon = {"ID": "SABRE"}
+        inventory.set_offhand_item(0, {"ID": "PISTOL"})
+        self.assertEqual(inventory.melee_weapon, {"ID": "SABRE"})
+        self.assertEqual(inventory.offhand_items[0], {"ID": "PISTOL"})
+        # the other regiment shared the inventory and still has the old one
+        other = Regiment(data["PlayerSaveData"]["ArmySaveData"]["Divisions"][0]["Regiments"][1])
+        self.assertIsInstance(other.data, SHARED_TYPES)
+        self.assertIsNone(other.inventory.melee_weapon)
+
+    def test_inventory_read_keeps_shared(self):
+        # reading the inventory of a private regiment doesn't copy the InventorySave it shares
+        data = _save()
+        regiment = Regiment(writable(data, ARMY + ("Divisions", 0, "Regiments", 0)))
+        shared = regiment.data["InventorySave"]
+        self.assertIsNone(regiment.inventory.melee_weapon)
+        self.assertIs(regiment.data["InventorySave"], shared)
+        self.assertIsInstance(shared, SHARED_TYPES)
+        regiment.inventory.backpack = {"ID": "RATIONS"}
+        self.assertIsNot(regiment.data["InventorySave"], shared)
+        self.assertEqual(regiment.inventory.backpack, {"ID": "RATIONS"})
+
+if __name__ == "__main__":
+    unittest.main()
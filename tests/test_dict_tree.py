@@ -0,0 +1,48 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from PySide6.QtCore import QCoreApplication
+from dict_tree import DictTreeModel
+from template_ingest import LazyTemplateFolder
+
+class FindTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        files = {}
+        for stem in ("BUST_A", "BUST_B", "BUST_C"):
+            files[stem] = Path(folder.name) / f"{stem}.json"
+            files[stem].write_text(json.dumps({"ID": stem, "Hair": f"{stem}_HAIR"}), encoding="utf-8")
+        self.busts = LazyTemplateFolder(files, 2)
+        self.model = DictTreeModel()
+        self.model.set_data(self.busts)
+
+    def test_find_keeps_undecoded(self):
+        # searching a folder of thousands of busts must not decode every one of them
+        self.assertEqual(self.model.find("bust_b"), [("BUST_B",)])
+        self.assertEqual(self.model.find("hair"), [])
+        self.assertIsNone(self.busts.peek("BUST_B"))
+
+    def test_find_decoded(self):
+        self.busts["BUST_C"]
+        self.assertEqual(self.model.find("hair"), [("BUST_C", "Hair")])
+        self.assertEqual(self.model.find("c_hair"), [("BUST_C", "Hair")])
+        self.assertEqual(self.model.find("_c"), [("BUST_C",), ("BUST_C", "ID"), ("BUST_C", "Hair")])
+        self.assertEqual(self.model.find("_c_h"), [("BUST_C", "Hair")])
+
+    def test_find_plain_dicts(self):
+        self.model.set_data({"Units": [{"ID": "LINE"}, {"ID": "HUSSAR"}]})
+        self.assertEqual(self.model.find("hus"), [("Units", 1, "ID")])
+        self.assertEqual(self.model.find("huss"), [("Units", 1, "ID")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from save_diff import MISSING, Change, diff_save, hash_tree, rehash_paths
+
+class DiffTest(unittest.TestCase):
+    def test_colliding_hashes(self):
+        # hash(-1) == hash(-2) in CPython, the digests must still tell them apart
+        self.assertEqual(diff_save(hash_tree({"a": -1}), {"a": -2}), [Change(("a",), -1, -2)])
+        self.assertEqual(diff_save(hash_tree({"a": [-1, "x"]}), {"a": [-2, "x"]}), [Change(("a", 0), -1, -2)])
+
+    def test_types_differ(self):
+        self.assertEqual(diff_save(hash_tree([1, True]), [1.0, 1]), [Change((0,), 1, 1.0), Change((1,), True, 1)])
+
+    def test_key_order_and_members(self):
+        snapshot = hash_tree({"a": 1, "b": 2})
+        self.assertEqual(diff_save(snapshot, {"a": 1, "b": 2}), [])
+        self.assertEqual(diff_save(snapshot, {"a": 1, "c": 2}), [Change(("b",), 2, MISSING), Change(("c",), MISSING, 2)])
+
+    def test_rehash_paths(self):
+        data = {"army": [{"level": -1}, {"level": 3}], "cash": 5}
+        snapshot = hash_tree(data)
+        data["army"][0]["level"] = -2
+        tree = rehash_paths(snapshot, data, [("army", 0, "level")])
+        self.assertEqual(tree.digest, hash_tree(data).digest)
+        self.assertNotEqual(tree.digest, snapshot.digest)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from save_diff import hash_tree
+from save_history import SaveHistory
+
+def _save() -> dict:
+    return {"PlayerSaveData": {"Cash": -1, "ArmySaveData": {"Divisions": [{"Regiments": [{"CurrentLevel": -1}]}]}}}
+
+class HistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.data = _save()
+        self.history = SaveHistory()
+        self.history.reset(self.data)
+
+    def test_colliding_edit_undone(self):
+        # hash(-1) == hash(-2), the edit is still a step
+        self.data["PlayerSaveData"]["Cash"] = -2
+        changes = self.history.checkpoint(self.data, [("PlayerSaveData", "Cash")])
+        self.assertEqual([(change.old, change.new) for change in changes], [(-1, -2)])
+        self.assertTrue(self.history.can_undo())
+        self.history.undo(self.data)
+        self.assertEqual(self.data, _save())
+        self.history.redo(self.data)
+        self.assertEqual(self.data["PlayerSaveData"]["Cash"], -2)
+        self.assertEqual(self.history.snapshot.digest, hash_tree(self.data).digest)
+
+    def test_full_checkpoint(self):
+        path = ("PlayerSaveData", "ArmySaveData", "Divisions", 0, "Regiments", 0, "CurrentLevel")
+        self.data["PlayerSaveData"]["ArmySaveData"]["Divisions"][0]["Regiments"][0]["CurrentLevel"] = -2
+        changes = self.history.checkpoint(self.data)
+        self.assertEqual([change.path for change in changes], [path])
+        self.history.undo(self.data)
+        self.assertEqual(self.data, _save())
+
+    def test_nothing_edited(self):
+        self.assertEqual(self.history.checkpoint(self.data, []), [])
+        self.assertFalse(self.history.can_undo())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from save_intern import writable
+from save_splice import load_save
+
+def _regiment(index: int) -> dict:
+    return {
+        "UnitID": f"UNIT_{index % 3}",
+        "CurrentLevel": 2,
+        "Experience": 25.5,
+        "Manpower": 500,
+        "InventorySave": {"MeleeWeaponSlot": {"ItemSave": {"ID": "SABRE", "Durability": 25.5}}, "Backpack": []},
+    }
+
+def _officer(index: int) -> dict:
+    return {"Name": f"O'Neil {index}", "Level": 3, "Experience": 25.5, "SkillSaves": ["SKILL_3"]}
+
+def _game_save() -> bytes:
+    # laid out like the game writes them, two space indents, escaped quotes and trailing zeros
+    # json.dumps writes neither, so the bytes can only round trip by being copied
+    data = {
+        "PlayerSaveData": {
+            "Cash": 100,
+            "Food": 20.0,
+            "Ammo": 30,
+            "Manpower": 400,
+            "ArmySaveData": {
+                "Divisions": [
+                    {"Regiments": [_regiment(index) for index in range(4)], "OfficerSave": _officer(division)}
+                    for division in range(3)
+                ],
+                "ReserveRegiments": [_regiment(index) for index in range(2)],
+                "ReserveOfficers": [_officer(index) for index in range(2)],
+            },
+        },
+        "WorldSaveData": {"Seed": 7, "Flags": ["A", "B"]},
+    }
+    text = json.dumps(data, indent=2).replace("'", "\\u0027").replace(": 25.5", ": 25.50")
+    return text.replace("\n", "\r\n").encode("utf-8")
+
+class SpliceTest(unittest.TestCase):
+    def setUp(self):
+        handle, name = tempfile.mkstemp(suffix=".fcs")
+        with os.fdopen(handle, "wb") as f:
+            f.write(_game_save())
+        self.path = Path(name)
+        self.addCleanup(self.path.unlink)
+        self.raw = self.path.read_bytes()
+
+    def _changed_lines(self, rendered: bytes) -> list[tuple[bytes, bytes]]:
+        before, after = self.raw.split(b"\r\n"), rendered.split(b"\r\n")
+        self.assertEqual(len(before), len(after))
+        return [(old.strip(), new.strip()) for old, new in zip(before, after) if old != new]
+
+    def test_unedited_round_trip(self):
+        data, source = load_save(self.path)
+        self.assertEqual(source.render(data), self.raw)
+
+    def test_interned_round_trip(self):
+        # shared containers are dict and list subclasses, nothing unedited is written again
+        data, source = load_save(self.path, intern=True)
+        self.assertEqual(source.render(data), self.raw)
+
+    def test_interned_member_edit(self):
+        data, source = load_save(self.path, intern=True)
+        path = ("PlayerSaveData", "ArmySaveData", "Divisions", 2, "Regiments", 0)
+        writable(data, path)["CurrentLevel"] = 3
+        self.assertEqual(self._changed_lines(source.render(data)), [(b'"CurrentLevel": 2,', b'"CurrentLevel": 3,')])
+
+    def test_changed_type_written(self):
+        # 2 == 2.0, the game reads them differently
+        data, source = load_save(self.path)
+        data["PlayerSaveData"]["ArmySaveData"]["ReserveRegiments"][1]["CurrentLevel"] = 2.0
+        self.assertEqual(self._changed_lines(source.render(data)), [(b'"CurrentLevel": 2,', b'"CurrentLevel": 2.0,')])
+
+    def test_regiment_member_edit(self):
+        # the rest of the regiment keeps its bytes, 25.50 isn't written back as 25.5
+        data, source = load_save(self.path)
+        army = data["PlayerSaveData"]["ArmySaveData"]
+        army["Divisions"][1]["Regiments"][2]["CurrentLevel"] = 5
+        army["ReserveRegiments"][0]["Manpower"] = 450
+        self.assertEqual(self._changed_lines(source.render(data)), [
+            (b'"CurrentLevel": 2,', b'"CurrentLevel": 5,'),
+            (b'"Manpower": 500,', b'"Manpower": 450,'),
+        ])
+
+    def test_officer_member_edit(self):
+        data, source = load_save(self.path)
+        army = data["PlayerSaveData"]["ArmySaveData"]
+        army["Divisions"][0]["OfficerSave"]["Level"] = 4
+        army["ReserveOfficers"][1]["Name"] = "Ney"
+        self.assertEqual(self._changed_lines(source.render(data)), [
+            (b'"Level": 3,', b'"Level": 4,'),
+            (b'"Name": "O\\u0027Neil 1",', b'"Name": "Ney",'),
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
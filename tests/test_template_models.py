@@ -0,0 +1,32 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from PySide6.QtCore import QCoreApplication, Qt
+from template_models import TemplateItemModel
+
+class SharedNameTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def _texts(self, model: TemplateItemModel) -> list[str]:
+        return [model.index(row).data() for row in range(1, model.rowCount())]
+
+    def test_shared_names(self):
+        template = {"LINE_A": "Line", "LINE_B": "Line", "HUSSAR": "Hussar"}
+        model = TemplateItemModel(lambda key, value: value)
+        model.set_template(template)
+        self.assertEqual(model.keys("Line"), ["LINE_A", "LINE_B"])
+        self.assertEqual(self._texts(model), ["Hussar", "Line (LINE_A)", "Line (LINE_B)"])
+        self.assertEqual(model.index(model.row("LINE_B")).data(Qt.ItemDataRole.UserRole), "LINE_B")
+
+        template["LINE_B"] = "Dragoon"
+        model.update(template, ["LINE_B"])
+        self.assertEqual(model.keys("Line"), ["LINE_A"])
+        self.assertEqual(self._texts(model), ["Dragoon", "Hussar", "Line"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from constants import BUST_DIR, FLAG_DIR, LOC_DIR, QUESTS_DIR, SKILLS_DIR, UNITS_DIR, UPGRADE_DIR
+from template_cache import TemplateCache
+from template_store import TemplateLoadError, TemplateStore, templates_ready
+
+def _write(file: Path, value):
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(json.dumps(value, indent=2), encoding="utf-8")
+
+def _game(root: Path) -> Path:
+    # the smallest folder every template loads from
+    _write(root / UNITS_DIR, [{"ID": "UNIT_1", "Name": "UNIT_NAME_1", "RawUnitType": "LINE_INFANTRY"}])
+    _write(root / UPGRADE_DIR, {"TREE_A": {"Items": {"UNIT_1": {"Prerequisite": None}}}})
+    _write(root / FLAG_DIR, {"FlagTemplates": {"FLAG_A": {"Patterns": ["P"]}}})
+    _write(root / LOC_DIR, {"Terms": [{"Key": "UNIT_NAME_1", "Translation": "Line"}, {"Key": "SKILL_HDR", "Translation": "Drill"}]})
+    _write(root / BUST_DIR / "UNIT_1.json", {"ID": "UNIT_1"})
+    _write(root / QUESTS_DIR / "Q_1.json", {"ID": "SKILL_1", "TooltipNodes": [{"HeaderKey": "SKILL_HDR"}]})
+    _write(root / SKILLS_DIR / "SKILL_1.json", {"ID": "SKILL_1"})
+    return root
+
+class LoadErrorTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.game = _game(Path(folder.name) / "game")
+        self.cache = TemplateCache(Path(folder.name) / "templates.cache")
+
+    def _error(self, file: Path, value) -> str:
+        # the load error with file damaged, the file is put back afterwards
+        original = (self.game / file).read_text(encoding="utf-8")
+        _write(self.game / file, value)
+        store = TemplateStore(workers=1)
+        try:
+            with self.assertRaises(TemplateLoadError) as raised:
+                store.load_templates(self.game)
+        finally:
+            (self.game / file).write_text(original, encoding="utf-8")
+        self.assertFalse(templates_ready(store))
+        return str(raised.exception)
+
+    def test_loads(self):
+        store = TemplateStore(workers=1)
+        store.load_templates(self.game)
+        self.assertEqual(store.unit_template["UNIT_1"]["Name"], "Line")
+        self.assertEqual(store.skill_template, {"SKILL_1": "Drill"})
+
+    def test_damaged_files_named(self):
+        # a bare KeyError or TypeError would escape the loader thread and never be reported
+        self.assertIn("Languages", self._error(LOC_DIR, {"mSource": {}}))
+        self.assertIn("Languages", self._error(LOC_DIR, {"Terms": [{"Key": "A", "Translation": "x"}, {"Nope": 1}]}))
+        self.assertIn("Template_Units.json", self._error(UNITS_DIR, [{"Name": "UNIT_NAME_1"}]))
+        self.assertIn("FlagTemplates.json", self._error(FLAG_DIR, []))
+
+    def test_cancelled_load_keeps_cache(self):
+        TemplateStore(workers=1).load_templates(self.game, self.cache, cancelled=lambda: True)
+        self.assertFalse(self.cache.file.exists())
+        TemplateStore(workers=1).load_templates(self.game, self.cache, cancelled=lambda: False)
+        self.assertIsNotNone(self.cache.read(self.game))
+
+class RefreshTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.game = _game(Path(folder.name) / "game")
+        self.store = TemplateStore(workers=1)
+        self.store.load_templates(self.game)
+
+    def test_failed_refresh_keeps_store(self):
+        # upgrades merge before the localization fails, none of it may stay half applied
+        upgrades = self.store.upgrade_template
+        fingerprints = self.store.fingerprints
+        _write(self.game / UPGRADE_DIR, {"TREE_B": {"Items": {}}})
+        _write(self.game / LOC_DIR, {"Terms": [{"Key": "UNIT_NAME_1"}]})
+        with self.assertRaises(TemplateLoadError):
+            self.store.refresh(self.game)
+        self.assertIs(self.store.upgrade_template, upgrades)
+        self.assertEqual(list(upgrades), ["TREE_A"])
+        self.assertIs(self.store.fingerprints, fingerprints)
+
+        # the retry once the file is whole still reports the upgrades as changed
+        _write(self.game / LOC_DIR, {"Terms": [{"Key": "UNIT_NAME_1", "Translation": "Column"}]})
+        changes = self.store.refresh(self.game)
+        self.assertEqual(changes.upgrades, {"TREE_A", "TREE_B"})
+        self.assertEqual(changes.units, {"UNIT_1"})
+        self.assertEqual(self.store.unit_template["UNIT_1"]["Name"], "Column")
+
+if __name__ == "__main__":
+    unittest.main()